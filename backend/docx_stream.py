@@ -0,0 +1,109 @@
+# backend/docx_stream.py
+"""Streaming DOCX reader.
+
+Iterparses ``word/document.xml`` straight out of the zip instead of
+building python-docx's full object model, so memory stays flat on
+book-length files. Paragraphs and table rows come out in document order.
+"""
+import zipfile
+from xml.etree.ElementTree import iterparse
+
+from backend.sources import open_stream
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+_TEXT = W + "t"
+_TAB = W + "tab"
+_BREAKS = (W + "br", W + "cr")
+_PARAGRAPH = W + "p"
+_ROW = W + "tr"
+_CELL = W + "tc"
+_TABLE = W + "tbl"
+
+
+def iter_docx_blocks(source, max_chars=None):
+    """Yield ("paragraph" | "row", text) in document order.
+
+    ``source`` is a path, bytes or a binary file object. Table rows are the cell
+    texts joined with " | "; nested tables are folded into their cell.
+    With ``max_chars`` the reader stops (and truncates the last block)
+    once that many characters have been produced.
+    """
+    emitted = 0
+
+    with zipfile.ZipFile(open_stream(source)) as archive, archive.open("word/document.xml") as xml:
+        runs = []       # text pieces of the current paragraph
+        cells = []      # stack: paragraphs of each open table cell
+        rows = []       # stack: cells of each open table row
+
+        for event, elem in iterparse(xml, events=("start", "end")):
+            tag = elem.tag
+
+            if event == "start":
+                if tag == _ROW:
+                    rows.append([])
+                elif tag == _CELL:
+                    cells.append([])
+                continue
+
+            if tag == _TEXT:
+                runs.append(elem.text or "")
+            elif tag == _TAB:
+                runs.append("\t")
+            elif tag in _BREAKS:
+                runs.append("\n")
+
+            elif tag == _PARAGRAPH:
+                text = "".join(runs)
+                runs = []
+                elem.clear()
+                if cells:
+                    cells[-1].append(text)
+                    continue
+                if not text.strip():
+                    continue
+
+                if max_chars is not None and emitted + len(text) >= max_chars:
+                    yield "paragraph", text[:max_chars - emitted]
+                    return
+                emitted += len(text)
+                yield "paragraph", text
+
+            elif tag == _CELL:
+                paragraphs = cells.pop()
+                rows[-1].append("\n".join(p for p in paragraphs if p.strip()))
+
+            elif tag == _ROW:
+                row = " | ".join(rows.pop())
+                elem.clear()
+                if cells:
+                    # row of a nested table: part of the enclosing cell
+                    cells[-1].append(row)
+                    continue
+
+                if max_chars is not None and emitted + len(row) >= max_chars:
+                    yield "row", row[:max_chars - emitted]
+                    return
+                emitted += len(row)
+                yield "row", row
+
+            elif tag == _TABLE:
+                elem.clear()
+
+
+def extract_text_from_docx_stream(source, report=None, max_chars=None):
+    try:
+        blocks = [text for _, text in iter_docx_blocks(source, max_chars)]
+    except Exception as e:
+        # BadZipFile, missing word/document.xml, malformed XML (ParseError)
+        return f"ERROR: Failed to read DOCX → {e}"
+
+    if report is not None and max_chars is not None:
+        report["truncated"] = sum(len(b) for b in blocks) >= max_chars
+
+    return "\n".join(blocks).strip()
+
+
+def preview_docx(source, max_chars=1000):
+    """First ``max_chars`` characters without parsing the rest of the file."""
+    return extract_text_from_docx_stream(source, max_chars=max_chars)
@@ -0,0 +1,66 @@
+# backend/extraction_cache.py
+"""Extraction results cached by SHA-256 of the file bytes.
+
+A Streamlit rerun, another session or another user uploading the same
+file gets the cleaned text and metadata back from the cache instead of
+extracting again.
+"""
+import hashlib
+
+from backend.sources import open_buffer, source_name
+from backend.text_extractor import extract_text
+from config.settings import (
+    EXTRACTION_CACHE_MAX_ENTRIES,
+    EXTRACTION_CACHE_TTL,
+    EXTRACTION_CACHE_DB_MAX_ENTRIES,
+    EXTRACTION_CACHE_MAX_DB_CHARS
+)
+from utils.cache import LRUCache, MongoCache, TieredCache
+from utils.database import extraction_cache as extraction_cache_collection
+
+extraction_cache = TieredCache(
+    LRUCache(EXTRACTION_CACHE_MAX_ENTRIES, ttl=EXTRACTION_CACHE_TTL),
+    MongoCache(
+        extraction_cache_collection,
+        ttl=EXTRACTION_CACHE_TTL,
+        max_entries=EXTRACTION_CACHE_DB_MAX_ENTRIES
+    )
+)
+
+
+def file_sha256(source):
+    with open_buffer(source) as buf:
+        return hashlib.sha256(buf).hexdigest()
+
+
+def extract_text_cached(source, file_type=None, backend=None):
+    """``extract_text`` with a content-hash cache in front of it."""
+    name = source_name(source) or ""
+    ext = (file_type or name.split(".")[-1]).lower().lstrip(".")
+    digest = file_sha256(source)
+    key = f"{ext}:{digest}"
+
+    cached = extraction_cache.get(key)
+    if cached is not None:
+        return {
+            "status": "success",
+            "text": cached["text"],
+            "metadata": dict(cached["metadata"], sha256=digest, cache_hit=True)
+        }
+
+    result = extract_text(source, file_type=ext, backend=backend)
+    if result["status"] != "success":
+        return result
+
+    entry = {"text": result["text"], "metadata": result["metadata"]}
+    if len(entry["text"]) <= EXTRACTION_CACHE_MAX_DB_CHARS:
+        extraction_cache.set(key, entry)
+    else:
+        extraction_cache.memory.set(key, entry)
+
+    result["metadata"] = dict(result["metadata"], sha256=digest, cache_hit=False)
+    return result
+
+
+def extraction_cache_stats():
+    return extraction_cache.stats()
@@ -0,0 +1,106 @@
+# backend/extractor_registry.py
+"""Registry of text extraction backends, keyed by file type.
+
+Backends declare what they need installed and what they can do:
+``streaming`` backends read file objects without loading them whole, and
+``page_ranges`` backends take ``start`` / ``end`` page keywords (end
+exclusive; ``report["page_count"]`` stays the whole document's). When a
+file type has several installed backends, the fastest one wins: measured
+pages/second from scripts/benchmark_extractors.py if available, otherwise
+the declared speed class.
+"""
+import importlib.util
+import json
+import os
+
+from config.settings import EXTRACTOR_BENCHMARK_FILE
+
+SPEED_CLASSES = {"fast": 0, "medium": 1, "slow": 2}
+
+_registry = {}
+
+
+class ExtractorBackend:
+    def __init__(self, file_type, name, fn, requires=(), streaming=False,
+                 page_ranges=False, speed="medium"):
+        if speed not in SPEED_CLASSES:
+            raise ValueError(f"Unknown speed class: {speed}")
+        self.file_type = file_type
+        self.name = name
+        self.fn = fn
+        self.requires = tuple(requires)
+        self.streaming = streaming
+        self.page_ranges = page_ranges
+        self.speed = speed
+
+    @property
+    def installed(self):
+        return all(importlib.util.find_spec(m) is not None for m in self.requires)
+
+    def __call__(self, source, **kwargs):
+        return self.fn(source, **kwargs)
+
+    def __repr__(self):
+        return f"<ExtractorBackend {self.file_type}:{self.name} ({self.speed})>"
+
+
+def register_extractor(file_type, name, fn, requires=(), streaming=False,
+                       page_ranges=False, speed="medium"):
+    backend = ExtractorBackend(file_type, name, fn, requires, streaming, page_ranges, speed)
+    backends = _registry.setdefault(file_type, [])
+    backends[:] = [b for b in backends if b.name != name] + [backend]
+    return backend
+
+
+_measured = (None, {})
+
+
+def _measured_speeds():
+    # re-read only when the benchmark has rewritten the file
+    global _measured
+    try:
+        mtime = os.path.getmtime(EXTRACTOR_BENCHMARK_FILE)
+    except OSError:
+        return {}
+    if _measured[0] != mtime:
+        try:
+            with open(EXTRACTOR_BENCHMARK_FILE, encoding="utf-8") as f:
+                _measured = (mtime, json.load(f))
+        except (OSError, ValueError):
+            _measured = (mtime, {})
+    return _measured[1]
+
+
+def available_extractors(file_type):
+    """Installed backends for a file type, fastest first."""
+    measured = _measured_speeds().get(file_type, {})
+
+    def rank(backend):
+        pages_per_s = measured.get(backend.name, {}).get("pages_per_s")
+        if pages_per_s:
+            return (0, -pages_per_s)
+        return (1, SPEED_CLASSES[backend.speed])
+
+    return sorted((b for b in _registry.get(file_type, []) if b.installed), key=rank)
+
+
+def get_extractor(file_type, name=None, streaming=False, page_ranges=False):
+    """Pick a backend by name, or the fastest installed one with the
+    requested capabilities. Returns None if nothing fits."""
+    for backend in available_extractors(file_type):
+        if name and backend.name != name:
+            continue
+        if streaming and not backend.streaming:
+            continue
+        if page_ranges and not backend.page_ranges:
+            continue
+        return backend
+    return None
+
+
+def supported_file_types():
+    return sorted(t for t in _registry if available_extractors(t))
+
+
+def list_extractors():
+    return {t: list(backends) for t, backends in _registry.items()}
@@ -1,7 +1,18 @@
 # backend/preprocessing.py
 import re
-from langdetect import detect
-from nltk.tokenize import sent_tokenize
+from collections import Counter
+
+from langdetect import DetectorFactory, detect
+from langdetect.lang_detect_exception import LangDetectException
+
+from backend.segmenter import segment_sentences, segment_spans
+from config.settings import LANGDETECT_SAMPLES, LANGDETECT_SAMPLE_CHARS, LANGDETECT_SEED
+from utils.cache import LRUCache, content_key
+from utils.chunking import (
+    chunk_by_tokens, get_tokenizer, pack_spans, token_budget, token_spans
+)
+
+DetectorFactory.seed = LANGDETECT_SEED
 
 # ---------------- CLEAN TEXT ----------------
 def clean_text(text: str) -> str:
@@ -12,90 +23,127 @@ def clean_text(text: str) -> str:
 
 
 # ---------------- LANGUAGE DETECTION ----------------
+_language_cache = LRUCache(max_entries=256)
+
+
+def _sample_windows(text, samples, size):
+    """Evenly spaced windows, skipping the front matter at the very start."""
+    if samples <= 1 or len(text) <= samples * size:
+        return [text]
+    windows = []
+    for i in range(1, samples + 1):
+        start = (len(text) - size) * i // (samples + 1)
+        # don't start mid-word
+        space = text.find(" ", start, start + 100)
+        if space != -1:
+            start = space + 1
+        windows.append(text[start:start + size])
+    return windows
+
+
 def detect_language(text: str) -> str:
-    try:
-        return detect(text)
-    except:
-        return "unknown"
+    """Majority vote over sampled windows, cached per text.
+
+    Stops as soon as one language holds a majority of the planned windows,
+    which is the answer the remaining windows could not change.
+    """
+    key = content_key(text)
+    language = _language_cache.get(key)
+    if language is not None:
+        return language
+
+    windows = _sample_windows(text, LANGDETECT_SAMPLES, LANGDETECT_SAMPLE_CHARS)
+    votes = Counter()
+    for window in windows:
+        try:
+            lang = detect(window)
+        except LangDetectException:
+            continue
+        votes[lang] += 1
+        if votes[lang] > len(windows) // 2:
+            break
+
+    language = votes.most_common(1)[0][0] if votes else "unknown"
+    _language_cache.set(key, language)
+    return language
 
 
 # ---------------- SENTENCE SEGMENTATION ----------------
-def segment_sentences(text: str):
-    return sent_tokenize(text)
+# segment_spans / segment_sentences come from backend.segmenter
+# (SEGMENTER picks punkt or regex; long texts are split across processes)
+def sentence_word_counts(text: str, spans):
+    return [len(text[start:end].split()) for start, end in spans]
 
 
 # ---------------- TEXT STATS ----------------
-def calculate_text_stats(text: str):
-    words = text.split()
-    sentences = segment_sentences(text)
+def calculate_text_stats(text: str, spans=None, word_counts=None):
+    if spans is None:
+        spans = segment_spans(text)
+    if word_counts is None:
+        word_counts = sentence_word_counts(text, spans)
+    words = sum(word_counts)
 
     return {
-        "word_count": len(words),
+        "word_count": words,
         "char_count": len(text),
-        "sentence_count": len(sentences),
-        "avg_sentence_length": len(words) / max(len(sentences), 1),
-        "estimated_read_time_min": round(len(words) / 200, 2)
+        "sentence_count": len(spans),
+        "avg_sentence_length": words / max(len(spans), 1),
+        "estimated_read_time_min": round(words / 200, 2)
     }
 
 
 # ---------------- CHUNKING ----------------
-def chunk_text(text, chunk_size=1000, overlap=150):
-    sentences = segment_sentences(text)
+# chunk_size / overlap are measured in model tokens (see utils.chunking)
+def chunk_text(text, chunk_size=None, overlap=0):
+    return chunk_by_tokens(text, max_tokens=chunk_size, overlap_tokens=overlap)
 
+
+# chunks are offsets, not copies; ``lengths`` are the spans' sizes in
+# whatever unit ``budget`` and ``overlap`` use
+def chunk_spans(spans, lengths, budget, overlap=0):
     chunks = []
-    current_chunk = []
-    current_words = 0
-    chunk_id = 1
-
-    for sent in sentences:
-        sent_words = len(sent.split())
-
-        if current_words + sent_words > chunk_size:
-            chunks.append({
-                "chunk_id": chunk_id,
-                "text": " ".join(current_chunk)
-            })
-            chunk_id += 1
-
-            # overlap
-            overlap_words = []
-            count = 0
-            for s in reversed(current_chunk):
-                overlap_words.insert(0, s)
-                count += len(s.split())
-                if count >= overlap:
-                    break
-
-            current_chunk = overlap_words + [sent]
-            current_words = sum(len(s.split()) for s in current_chunk)
-        else:
-            current_chunk.append(sent)
-            current_words += sent_words
-
-    if current_chunk:
+    for first, last in pack_spans(lengths, budget, overlap):
         chunks.append({
-            "chunk_id": chunk_id,
-            "text": " ".join(current_chunk)
+            "chunk_id": len(chunks) + 1,
+            "start": spans[first][0],
+            "end": spans[last - 1][1],
+            "token_count": sum(lengths[first:last])
         })
-
     return chunks
 
 
+def chunk_texts(text, chunks):
+    return [text[c["start"]:c["end"]] for c in chunks]
+
+
 # ---------------- PIPELINE ORCHESTRATOR ----------------
-def preprocess_for_summarization(text, chunk_size=1000):
-    if not text or len(text.split()) < 100:
+def preprocess_for_summarization(text, chunk_size=None, overlap=0, tokenizer=None):
+    """Clean, segment once and chunk ``text`` in linear time.
+
+    ``chunk_size`` / ``overlap`` are model tokens, as in ``chunk_text``, so
+    every chunk fits the summarizer's window. Chunks come back as character
+    offsets into ``cleaned_text``; use ``chunk_texts`` to materialize them.
+    """
+    if not text:
         raise ValueError("Text too short for summarization")
 
     cleaned = clean_text(text)
-    language = detect_language(cleaned)
-    sentences = segment_sentences(cleaned)
-    stats = calculate_text_stats(cleaned)
-    chunks = chunk_text(cleaned, chunk_size)
+    spans = segment_spans(cleaned)
+    word_counts = sentence_word_counts(cleaned, spans)
+    stats = calculate_text_stats(cleaned, spans, word_counts)
+    if stats["word_count"] < 100:
+        raise ValueError("Text too short for summarization")
+
+    tokenizer = tokenizer or get_tokenizer()
+    budget = token_budget(tokenizer, chunk_size)
+    pieces = token_spans(cleaned, spans, tokenizer, budget)
 
     return {
         "cleaned_text": cleaned,
-        "language": language,
-        "sentences": sentences,
+        "language": detect_language(cleaned),
+        "sentences": [cleaned[start:end] for start, end in spans],
+        "sentence_spans": spans,
         "stats": stats,
-        "chunks": chunks
-    }
\ No newline at end of file
+        "chunks": chunk_spans([(start, end) for start, end, _ in pieces],
+                              [tokens for _, _, tokens in pieces], budget, overlap)
+    }
@@ -0,0 +1,141 @@
+# backend/segmenter.py
+"""Sentence segmenters, keyed by name.
+
+Every segmenter maps text to ``(start, end)`` sentence offsets. Long texts
+are cut into blocks of about SEGMENT_BLOCK_CHARS at paragraph boundaries
+and the blocks are segmented across a process pool. The cut points depend
+only on the text, never on the worker count, so the output is identical
+however many workers run.
+"""
+import importlib.util
+import multiprocessing
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from config.settings import SEGMENTER, SEGMENT_WORKERS, SEGMENT_BLOCK_CHARS
+
+_registry = {}
+
+
+def register_segmenter(name, fn, requires=()):
+    _registry[name] = (fn, tuple(requires))
+
+
+def available_segmenters():
+    return [name for name, (_, requires) in _registry.items()
+            if all(importlib.util.find_spec(m) is not None for m in requires)]
+
+
+def get_segmenter(name=None):
+    name = name or SEGMENTER
+    if name not in _registry:
+        raise ValueError(f"Unknown segmenter: {name}")
+    return _registry[name][0]
+
+
+# ---------------- PUNKT ----------------
+@lru_cache(maxsize=None)
+def _punkt(language="english"):
+    # the same pretrained model sent_tokenize uses, loaded once
+    import nltk
+    try:
+        from nltk.tokenize.punkt import PunktTokenizer
+        return PunktTokenizer(language)
+    except ImportError:  # nltk < 3.8.2
+        return nltk.data.load(f"tokenizers/punkt/{language}.pickle")
+
+
+def punkt_spans(text):
+    return list(_punkt().span_tokenize(text))
+
+
+# ---------------- REGEX ----------------
+# terminal punctuation (plus closing quotes / brackets), whitespace, then
+# something that can open a sentence
+_BOUNDARY_RE = re.compile(
+    r"[.!?]+[\"')\]”’]*(?P<gap>\s+)(?=[\"'(\[“‘]?[A-Z0-9])"
+)
+_WORD_BEFORE_RE = re.compile(r"(\S+)\.$")
+
+ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof sr jr st mt ft vs etc e.g i.e cf al no vol ch fig "
+    "p pp ed eds jan feb mar apr jun jul aug sep sept oct nov dec gen col "
+    "capt lt sgt rev hon".split()
+)
+
+
+def regex_spans(text):
+    """Rule-based splitter: one compiled regex plus an abbreviation list."""
+    spans = []
+    start = len(text) - len(text.lstrip())
+    for m in _BOUNDARY_RE.finditer(text):
+        end = m.start("gap")
+        if text[end - 1] == ".":
+            word = _WORD_BEFORE_RE.search(text, max(start, end - 12), end)
+            # "Dr. Smith", "J. R. R. Tolkien"
+            if word and (word.group(1).lower() in ABBREVIATIONS or
+                         (len(word.group(1)) == 1 and word.group(1).isalpha())):
+                continue
+        spans.append((start, end))
+        start = m.end()
+
+    end = len(text.rstrip())
+    if start < end:
+        spans.append((start, end))
+    return spans
+
+
+register_segmenter("punkt", punkt_spans, requires=("nltk",))
+register_segmenter("regex", regex_spans)
+
+
+# ---------------- PARALLEL SEGMENTATION ----------------
+def paragraph_blocks(text, block_chars=SEGMENT_BLOCK_CHARS):
+    """``(start, end)`` blocks of about ``block_chars``, cut after a newline."""
+    blocks = []
+    start = 0
+    while start < len(text):
+        cut = text.find("\n", start + block_chars)
+        end = len(text) if cut == -1 else cut + 1
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+
+def _segment_block(args):
+    name, block, offset = args
+    return [(s + offset, e + offset) for s, e in get_segmenter(name)(block)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: this runs inside processes that already hold torch
+            # threads, where forking can deadlock; one pool for the process
+            # so Punkt loads once per worker, not once per call
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def segment_spans(text, name=None, workers=SEGMENT_WORKERS):
+    name = name or SEGMENTER
+    tasks = [(name, text[s:e], s) for s, e in paragraph_blocks(text)]
+    if workers <= 1 or len(tasks) <= 1:
+        results = map(_segment_block, tasks)
+    else:
+        results = _get_pool(workers).map(_segment_block, tasks)
+    return [span for spans in results for span in spans]
+
+
+def segment_sentences(text, name=None, workers=SEGMENT_WORKERS):
+    return [text[s:e] for s, e in segment_spans(text, name, workers)]
@@ -0,0 +1,91 @@
+# backend/sources.py
+"""Uniform access to extraction inputs: paths, bytes, memoryviews and
+binary file objects (e.g. Streamlit's UploadedFile, a BytesIO subclass)."""
+import io
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+
+def is_path(source):
+    return isinstance(source, (str, os.PathLike))
+
+
+def source_name(source):
+    if is_path(source):
+        return os.fspath(source)
+    return getattr(source, "name", None)
+
+
+def open_stream(source):
+    """Path or seekable binary stream, for readers that accept either."""
+    if is_path(source):
+        return source
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # these readers need a file object; wrapping raw bytes is the one copy
+        return io.BytesIO(source)
+    source.seek(0)
+    return source
+
+
+@contextmanager
+def map_file(file_path):
+    """Read-only memory map of a file (empty files give b"")."""
+    with open(file_path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap cannot map an empty file
+            yield b""
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+@contextmanager
+def open_buffer(source):
+    """Bytes-like view of the whole input without copying it where possible:
+    mmap for paths, getbuffer() for BytesIO, memoryview for bytes."""
+    if is_path(source):
+        with map_file(source) as buf:
+            yield buf
+    elif isinstance(source, memoryview):
+        yield source
+    elif isinstance(source, (bytes, bytearray)):
+        yield memoryview(source)
+    elif hasattr(source, "getbuffer"):
+        view = source.getbuffer()
+        try:
+            yield view
+        finally:
+            # BytesIO cannot be resized while a view is exported
+            view.release()
+    else:
+        if source.seekable():
+            source.seek(0)
+        yield source.read()
+
+
+@contextmanager
+def spooled_path(source, suffix=""):
+    """A file path for any input, for readers in other processes: paths as
+    they are, anything else copied to a temporary file deleted on exit."""
+    if is_path(source):
+        yield os.fspath(source)
+        return
+
+    fd, path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                f.write(source)
+            else:
+                source.seek(0)
+                shutil.copyfileobj(source, f, 1024 * 1024)
+        yield path
+    finally:
+        os.unlink(path)
@@ -0,0 +1,114 @@
+# backend/structure.py
+"""Chapter / section detection on extracted text.
+
+Headings are whole lines such as "Chapter 12", "CHAPTER FOUR: The Storm",
+"Part II", "Section 3.1" or "Prologue". The chapter index is a list of
+``{"index", "title", "level", "start", "end"}`` entries whose character
+offsets cover the text end to end; level 0 is a part, 1 a chapter, 2 a
+section.
+"""
+import re
+
+from config.settings import CHAPTER_MIN_CHARS
+
+_NUMBER_WORDS = frozenset(
+    "one two three four five six seven eight nine ten eleven twelve thirteen "
+    "fourteen fifteen sixteen seventeen eighteen nineteen twenty thirty forty "
+    "fifty sixty seventy eighty ninety hundred first second third fourth fifth "
+    "sixth seventh eighth ninth tenth last".split()
+)
+
+_LEVELS = {"part": 0, "book": 0, "chapter": 1, "section": 2}
+_NAMED = ("prologue", "epilogue", "introduction", "preface", "foreword",
+          "afterword", "conclusion", "interlude")
+
+
+def _cased(words):
+    # "Chapter" or "CHAPTER", never "chapter": wrapped prose lines start
+    # with lowercase keywords all the time
+    return "|".join(f"{w.capitalize()}|{w.upper()}" for w in words)
+
+
+# optional separator, then a short title that starts like one ("The
+# Storm", "'Home'"); "Part I had played..." continues in lowercase
+_TITLE = r"(?:[ \t]*[:.\-–—]?[ \t]+[\"'“‘(A-Z0-9][^\n,;]{0,50}?)?"
+
+_HEADING_RE = re.compile(
+    r"^[ \t]*(?:"
+    rf"(?P<kind>{_cased(_LEVELS)})[ \t]+"
+    r"(?P<num>\d+(?:\.\d+)*|[IVXLCDM]+|[A-Z][a-z]+(?:-[A-Za-z][a-z]+)?|[A-Z]+(?:-[A-Z]+)?)"
+    rf"\b[.:]?{_TITLE}"
+    rf"|(?P<named>{_cased(_NAMED)})\b[.:]?{_TITLE}"
+    r")[ \t]*$",
+    re.MULTILINE
+)
+
+_MAX_HEADING_WORDS = 10
+
+
+def _is_number(num):
+    if num[0].isdigit() or re.fullmatch(r"[IVXLCDM]+", num):
+        return True
+    return all(part in _NUMBER_WORDS for part in num.lower().split("-"))
+
+
+def find_headings(text, offset=0):
+    """``(start, level, title)`` for every heading line; ``start`` is the
+    line's offset in the full text when ``text`` is a block at ``offset``."""
+    headings = []
+    for m in _HEADING_RE.finditer(text):
+        title = m.group(0).strip()
+        if len(title.split()) > _MAX_HEADING_WORDS:
+            continue
+        if m.group("kind"):
+            if not _is_number(m.group("num")):
+                continue
+            level = _LEVELS[m.group("kind").lower()]
+        else:
+            level = 1
+        headings.append((m.start() + offset, level, title))
+    return headings
+
+
+def build_chapter_index(headings, text_length, min_chars=CHAPTER_MIN_CHARS):
+    """Turn heading positions into contiguous chapters.
+
+    A heading followed by less than ``min_chars`` before the next one (a
+    table-of-contents line, or "Part I" right above "Chapter 1") does not
+    open a chapter of its own. Text before the first heading becomes a
+    "Front matter" chapter when it is long enough, otherwise it joins the
+    first chapter. Returns [] when fewer than two chapters remain.
+    """
+    kept = []
+    for i, (start, level, title) in enumerate(headings):
+        next_start = headings[i + 1][0] if i + 1 < len(headings) else text_length
+        if next_start - start >= min_chars:
+            kept.append((start, level, title))
+
+    if len(kept) < 2:
+        return []
+
+    if kept[0][0] >= min_chars:
+        kept.insert(0, (0, 1, "Front matter"))
+    else:
+        kept[0] = (0,) + kept[0][1:]
+
+    chapters = []
+    for i, (start, level, title) in enumerate(kept):
+        end = kept[i + 1][0] if i + 1 < len(kept) else text_length
+        chapters.append({
+            "index": i,
+            "title": title,
+            "level": level,
+            "start": start,
+            "end": end
+        })
+    return chapters
+
+
+def detect_chapters(text, min_chars=CHAPTER_MIN_CHARS):
+    return build_chapter_index(find_headings(text), len(text), min_chars)
+
+
+def chapter_text(text, chapter):
+    return text[chapter["start"]:chapter["end"]].strip()
@@ -1,22 +1,26 @@
+import multiprocessing
 import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
 import PyPDF2
 import docx
-import chardet
+
+from backend.docx_stream import extract_text_from_docx_stream, iter_docx_blocks
+from backend.extractor_registry import register_extractor, get_extractor
+from backend.sources import is_path, open_stream, source_name, spooled_path
+from backend.txt_reader import read_text_file, detect_stream_encoding, iter_stream_decoded
+from config.settings import PDF_WORKERS, PDF_WINDOW_PAGES
 
 # -----------------------------------------------
 # Extract text from TXT
 # -----------------------------------------------
-def extract_text_from_txt(file_path):
+def extract_text_from_txt(source, report=None):
     try:
-        # Detect encoding first
-        with open(file_path, "rb") as f:
-            raw = f.read()
-            result = chardet.detect(raw)
-            encoding = result["encoding"] or "utf-8"
-
-        # Try reading with detected encoding
-        with open(file_path, "r", encoding=encoding, errors="ignore") as f:
-            return f.read()
+        # one buffer: sampled encoding detection, then streaming decode
+        return read_text_file(source, report)
 
     except Exception as e:
         return f"ERROR: Failed to read TXT file → {e}"
@@ -25,27 +29,178 @@ def extract_text_from_txt(file_path):
 # -----------------------------------------------
 # Extract text from PDF
 # -----------------------------------------------
-def extract_text_from_pdf(file_path):
-    text = ""
+def iter_pdf_pages(source, start=0, end=None):
+    """Yield (page_index, text) for pages start..end of a path, stream or reader"""
+    if is_path(source):
+        with open(source, "rb") as f:
+            yield from iter_pdf_pages(PyPDF2.PdfReader(f), start, end)
+        return
+
+    if isinstance(source, PyPDF2.PdfReader):
+        reader = source
+    else:
+        reader = PyPDF2.PdfReader(open_stream(source))
+    end = len(reader.pages) if end is None else min(end, len(reader.pages))
+
+    for i in range(start, end):
+        yield i, reader.pages[i].extract_text() or ""
+
+
+def iter_pymupdf_pages(file_path, start=0, end=None):
+    """Same as ``iter_pdf_pages`` with PyMuPDF, for a path."""
+    import fitz
+
+    with fitz.open(file_path) as doc:
+        end = doc.page_count if end is None else min(end, doc.page_count)
+        for i in range(start, end):
+            yield i, doc[i].get_text()
+
+
+_PAGE_READERS = {"pypdf2": iter_pdf_pages, "pymupdf": iter_pymupdf_pages}
+
+
+def _extract_page_range(file_path, start, end, reader="pypdf2"):
+    return list(_PAGE_READERS[reader](file_path, start, end))
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, once per process: the app and workers already run
+            # torch threads, where forking can deadlock
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
 
+
+def parallel_pdf(page_count, workers=PDF_WORKERS, window=PDF_WINDOW_PAGES):
+    return workers > 1 and page_count > window
+
+
+def iter_pdf_text(file_path, page_count, workers=PDF_WORKERS, window=PDF_WINDOW_PAGES,
+                  reader="pypdf2", start=0, end=None):
+    """Yield (page_index, text) in page order for pages start..end.
+
+    Large PDFs are split into windows of pages extracted in parallel;
+    only about 2 x workers windows are in flight at once, so memory stays
+    bounded however long the file is. The workers reopen ``file_path``;
+    in-memory sources go through ``spooled_path`` first.
+    """
+    end = page_count if end is None else min(end, page_count)
+    if not parallel_pdf(end - start, workers, window):
+        yield from _PAGE_READERS[reader](file_path, start, end)
+        return
+
+    ranges = iter([(s, min(s + window, end)) for s in range(start, end, window)])
+
+    pool = _get_pool(workers)
+    pending = deque(
+        pool.submit(_extract_page_range, file_path, s, e, reader)
+        for s, e in islice(ranges, workers * 2)
+    )
     try:
-        with open(file_path, "rb") as f:
-            reader = PyPDF2.PdfReader(f)
+        while pending:
+            pages = pending.popleft().result()
+            for s, e in islice(ranges, 1):
+                pending.append(pool.submit(_extract_page_range, file_path, s, e, reader))
+            yield from pages
+    finally:
+        # the pool outlives this file; drop windows nobody will read
+        for future in pending:
+            future.cancel()
+
 
-            # Handle password-protected PDFs
+def extract_text_from_pdf(source, report=None, start=0, end=None):
+    try:
+        if is_path(source):
+            with open(source, "rb") as f:
+                reader = PyPDF2.PdfReader(f)
+                if reader.is_encrypted:
+                    return "ERROR: PDF is password-protected."
+                page_count = len(reader.pages)
+        else:
+            reader = PyPDF2.PdfReader(open_stream(source))
             if reader.is_encrypted:
                 return "ERROR: PDF is password-protected."
+            page_count = len(reader.pages)
+            if not parallel_pdf(_range_pages(page_count, start, end)):
+                return _join_pdf_pages(iter_pdf_pages(reader, start, end), page_count, report)
 
-            for page in reader.pages:
-                extracted = page.extract_text()
-                
-                if extracted:
-                    text += extracted + "\n\n"
-                else:
-                    # PDF may be scanned (image-based)
-                    return "ERROR: PDF appears to be scanned (no extractable text). OCR required."
+        # uploads are spooled to disk so the worker processes can reopen them
+        with spooled_path(source, ".pdf") as path:
+            pages = iter_pdf_text(path, page_count, start=start, end=end)
+            return _join_pdf_pages(pages, page_count, report)
 
-        return text.strip()
+    except Exception as e:
+        return f"ERROR: Failed to read PDF → {e}"
+
+
+def _range_pages(page_count, start, end):
+    return max((page_count if end is None else min(end, page_count)) - start, 0)
+
+
+def _join_pdf_pages(pages, page_count, report=None):
+    parts = []
+    empty_pages = []
+    for i, page_text in pages:
+        if page_text.strip():
+            parts.append(page_text)
+        else:
+            # scanned / image-only page: record it and keep going
+            empty_pages.append(i + 1)
+
+    if report is not None:
+        report["page_count"] = page_count
+        report["empty_pages"] = empty_pages
+
+    if not parts:
+        return "ERROR: PDF appears to be scanned (no extractable text). OCR required."
+
+    return "\n\n".join(parts).strip()
+
+
+def extract_text_from_pdf_pymupdf(source, report=None, start=0, end=None):
+    import fitz
+
+    try:
+        if is_path(source):
+            doc = fitz.open(source)
+        else:
+            doc = fitz.open(stream=open_stream(source), filetype="pdf")
+
+        with doc:
+            if doc.needs_pass:
+                return "ERROR: PDF is password-protected."
+            page_count = doc.page_count
+            if not parallel_pdf(_range_pages(page_count, start, end)):
+                last = page_count if end is None else min(end, page_count)
+                pages = ((i, doc[i].get_text()) for i in range(start, last))
+                return _join_pdf_pages(pages, page_count, report)
+
+        # same page windows as PyPDF2, read with PyMuPDF in each worker
+        with spooled_path(source, ".pdf") as path:
+            pages = iter_pdf_text(path, page_count, reader="pymupdf", start=start, end=end)
+            return _join_pdf_pages(pages, page_count, report)
+
+    except Exception as e:
+        return f"ERROR: Failed to read PDF → {e}"
+
+
+def extract_text_from_pdf_pdfplumber(source, report=None, start=0, end=None):
+    import pdfplumber
+
+    try:
+        with pdfplumber.open(open_stream(source)) as pdf:
+            pages = ((i, page.extract_text() or "")
+                     for i, page in enumerate(pdf.pages[start:end], start=start))
+            return _join_pdf_pages(pages, len(pdf.pages), report)
 
     except Exception as e:
         return f"ERROR: Failed to read PDF → {e}"
@@ -54,9 +209,9 @@ def extract_text_from_pdf(file_path):
 # -----------------------------------------------
 # Extract text from DOCX
 # -----------------------------------------------
-def extract_text_from_docx(file_path):
+def extract_text_from_docx(source, report=None):
     try:
-        document = docx.Document(file_path)
+        document = docx.Document(open_stream(source))
         text = ""
 
         # Extract text from paragraphs
@@ -76,6 +231,23 @@ def extract_text_from_docx(file_path):
         return f"ERROR: Failed to read DOCX → {e}"
 
 
+# -----------------------------------------------
+# Backend Registry
+# -----------------------------------------------
+register_extractor("txt", "builtin", extract_text_from_txt,
+                   requires=("chardet",), speed="fast")
+register_extractor("pdf", "pymupdf", extract_text_from_pdf_pymupdf,
+                   requires=("fitz",), page_ranges=True, speed="fast")
+register_extractor("pdf", "pypdf2", extract_text_from_pdf,
+                   requires=("PyPDF2",), streaming=True, page_ranges=True, speed="medium")
+register_extractor("pdf", "pdfplumber", extract_text_from_pdf_pdfplumber,
+                   requires=("pdfplumber",), page_ranges=True, speed="slow")
+register_extractor("docx", "stream", extract_text_from_docx_stream,
+                   streaming=True, speed="fast")
+register_extractor("docx", "python-docx", extract_text_from_docx,
+                   requires=("docx",), speed="medium")
+
+
 # -----------------------------------------------
 # Text Cleaning
 # -----------------------------------------------
@@ -93,24 +265,88 @@ def clean_text(text):
     return cleaned
 
 
+def iter_clean_lines(pieces):
+    """Incremental ``clean_text``: yields cleaned, non-empty lines from text
+    pieces that may split lines anywhere."""
+    carry = ""
+    for piece in pieces:
+        lines = (carry + piece.replace("\r\n", "\n").replace("\r", "\n")).split("\n")
+        carry = lines.pop()
+        for line in lines:
+            line = line.strip()
+            if line:
+                yield line
+    carry = carry.strip()
+    if carry:
+        yield carry
+
+
+# -----------------------------------------------
+# Incremental Extraction (large files)
+# -----------------------------------------------
+def _iter_stream_pages(stream, reader, page_count):
+    if not parallel_pdf(page_count):
+        yield from iter_pdf_pages(reader)
+        return
+    # the GridFS stream is spooled to disk so the page windows go parallel
+    with spooled_path(stream, ".pdf") as path:
+        yield from iter_pdf_text(path, page_count)
+
+
+def iter_extracted_text(stream, file_type, size, report=None):
+    """Yield raw text pieces from a seekable binary stream without holding
+    the whole document: PDF page by page, DOCX block by block, TXT in
+    decoded blocks."""
+    if file_type == "pdf":
+        reader = PyPDF2.PdfReader(stream)
+        if reader.is_encrypted:
+            raise ValueError("PDF is password-protected.")
+        page_count = len(reader.pages)
+        empty_pages = []
+        for i, text in _iter_stream_pages(stream, reader, page_count):
+            if text.strip():
+                yield text + "\n"
+            else:
+                empty_pages.append(i + 1)
+        if report is not None:
+            report["page_count"] = page_count
+            report["empty_pages"] = empty_pages
+
+    elif file_type == "docx":
+        for _, text in iter_docx_blocks(stream):
+            yield text + "\n"
+
+    elif file_type == "txt":
+        encoding, confidence = detect_stream_encoding(stream, size)
+        if report is not None:
+            report["encoding"] = encoding
+            report["encoding_confidence"] = round(confidence, 2)
+        yield from iter_stream_decoded(stream, encoding)
+
+    else:
+        raise ValueError(f"Unsupported file type: {file_type}")
+
+
 # -----------------------------------------------
 # Unified Extraction Function
 # -----------------------------------------------
-def extract_text(file_path):
-    if not os.path.exists(file_path):
+def extract_text(source, file_type=None, backend=None):
+    """Extract and clean text from a path, bytes, memoryview or binary file
+    object. ``file_type`` defaults to the extension of the path / ``.name``."""
+    if is_path(source) and not os.path.exists(source):
         return {"status": "error", "message": "File does not exist"}
 
-    ext = file_path.split(".")[-1].lower()
+    name = source_name(source) or ""
+    ext = (file_type or name.split(".")[-1]).lower().lstrip(".")
+    report = {}
 
-    if ext == "txt":
-        raw_text = extract_text_from_txt(file_path)
-    elif ext == "pdf":
-        raw_text = extract_text_from_pdf(file_path)
-    elif ext == "docx":
-        raw_text = extract_text_from_docx(file_path)
-    else:
+    # fastest installed backend for this file type, unless one is named
+    extractor = get_extractor(ext, name=backend)
+    if extractor is None:
         return {"status": "error", "message": f"Unsupported file type: {ext}"}
 
+    raw_text = extractor(source, report=report)
+
     if isinstance(raw_text, str) and raw_text.startswith("ERROR"):
         return {"status": "error", "message": raw_text}
 
@@ -122,6 +358,8 @@ def extract_text(file_path):
     metadata = {
         "word_count": len(cleaned.split()),
         "char_count": len(cleaned),
+        "extractor": extractor.name,
+        **report
     }
 
     return {
@@ -0,0 +1,132 @@
+# backend/txt_reader.py
+"""Single-pass TXT reading.
+
+The input is read once: a memory map for paths, the existing buffer for
+in-memory uploads. Encoding detection feeds a few sampled
+windows (start, evenly spaced middle windows, end) to chardet's
+incremental detector and stops as soon as it is confident in a non-ASCII
+encoding (ASCII says nothing about the windows not yet fed); the
+same mapping is then decoded block by block.
+"""
+import codecs
+import copy
+
+from chardet.universaldetector import UniversalDetector
+
+from backend.sources import open_buffer
+
+from config.settings import ENCODING_CONFIDENCE
+
+SAMPLE_BYTES = 64 * 1024
+SAMPLE_WINDOWS = 8
+DECODE_BLOCK = 1024 * 1024
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+
+def _sample_offsets(size, windows=SAMPLE_WINDOWS, sample=SAMPLE_BYTES):
+    if size <= sample * windows:
+        return list(range(0, size, sample))
+    step = (size - sample) // (windows - 1)
+    return [i * step for i in range(windows)]
+
+
+def _peek(detector):
+    # close() finalises the detector, so ask a copy
+    probe = copy.deepcopy(detector)
+    probe.close()
+    return probe.result
+
+
+def detect_encoding(buf, threshold=ENCODING_CONFIDENCE):
+    """Return (encoding, confidence) for a bytes-like buffer."""
+    return _detect(lambda offset, n: bytes(buf[offset:offset + n]), len(buf), threshold)
+
+
+def detect_stream_encoding(stream, size, threshold=ENCODING_CONFIDENCE):
+    """Same as ``detect_encoding`` for a seekable binary stream."""
+    def read_at(offset, n):
+        stream.seek(offset)
+        return stream.read(n)
+    return _detect(read_at, size, threshold)
+
+
+def _detect(read_at, size, threshold):
+    head = read_at(0, 4)
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding, 1.0
+
+    detector = UniversalDetector()
+    result = {"encoding": None, "confidence": 0.0}
+
+    for offset in _sample_offsets(size):
+        detector.feed(read_at(offset, SAMPLE_BYTES))
+        if detector.done:
+            break
+        result = _peek(detector)
+        # "ascii" only describes the bytes seen so far; a later window can
+        # still hold accented letters or smart quotes, so keep sampling
+        encoding = (result["encoding"] or "").lower()
+        if encoding not in ("", "ascii") and result["confidence"] >= threshold:
+            return _normalise(result["encoding"]), result["confidence"]
+
+    detector.close()
+    result = detector.result
+    return _normalise(result["encoding"]), result["confidence"] or 0.0
+
+
+def _normalise(encoding):
+    # ASCII samples say nothing about unsampled bytes; UTF-8 is a superset
+    if not encoding or encoding.lower() == "ascii":
+        return "utf-8"
+    return encoding
+
+
+def iter_decoded(buf, encoding, block_size=DECODE_BLOCK, errors="ignore"):
+    """Decode a buffer block by block; multi-byte characters split across
+    blocks are handled by the incremental decoder."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    for start in range(0, len(buf), block_size):
+        piece = decoder.decode(buf[start:start + block_size])
+        if piece:
+            yield piece
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def iter_stream_decoded(stream, encoding, block_size=DECODE_BLOCK, errors="ignore"):
+    """Like ``iter_decoded`` but reads the blocks from a binary stream."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors=errors)
+    stream.seek(0)
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            break
+        piece = decoder.decode(block)
+        if piece:
+            yield piece
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def read_text(buf, report=None):
+    encoding, confidence = detect_encoding(buf)
+    if report is not None:
+        report["encoding"] = encoding
+        report["encoding_confidence"] = round(confidence, 2)
+    return "".join(iter_decoded(buf, encoding))
+
+
+def read_text_file(source, report=None):
+    """Decode a path, bytes or binary file object."""
+    with open_buffer(source) as buf:
+        return read_text(buf, report)
@@ -0,0 +1,147 @@
+# config/settings.py
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _int(name, default):
+    return int(os.getenv(name, default))
+
+
+# ---------- SUMMARIZER ----------
+SUMMARIZER_MODEL = os.getenv("SUMMARIZER_MODEL", "facebook/bart-large-cnn")
+
+# Number of chunks sent to the model in one forward pass
+SUMMARY_BATCH_SIZE = _int("SUMMARY_BATCH_SIZE", 8)
+
+# Token window of the summarization model (BART: 1024)
+MAX_INPUT_TOKENS = _int("MAX_INPUT_TOKENS", 1024)
+
+# Unload the model after this many idle seconds (0 = keep loaded)
+SUMMARIZER_IDLE_TIMEOUT = _int("SUMMARIZER_IDLE_TIMEOUT", 900)
+
+# Start loading the model in the background when the app starts
+SUMMARIZER_WARMUP = os.getenv("SUMMARIZER_WARMUP", "1") == "1"
+
+# ---------- CHUNK SUMMARY CACHE ----------
+SUMMARY_CACHE_MAX_ENTRIES = _int("SUMMARY_CACHE_MAX_ENTRIES", 2048)
+SUMMARY_CACHE_TTL = _int("SUMMARY_CACHE_TTL", 7 * 24 * 3600)
+SUMMARY_CACHE_DB_MAX_ENTRIES = _int("SUMMARY_CACHE_DB_MAX_ENTRIES", 200000)
+
+# ---------- MAP-REDUCE ----------
+# Worker processes for the map step (1 = summarize in-process)
+SUMMARY_WORKERS = _int("SUMMARY_WORKERS", 1)
+
+# torch intra-op threads per worker process
+SUMMARY_WORKER_THREADS = _int(
+    "SUMMARY_WORKER_THREADS", max(1, (os.cpu_count() or 1) // max(SUMMARY_WORKERS, 1))
+)
+
+# Safety cap on reduce passes
+MAX_REDUCE_LEVELS = _int("MAX_REDUCE_LEVELS", 6)
+
+# ---------- INFERENCE BACKEND ----------
+# pytorch | int8 | onnx
+SUMMARIZER_BACKEND = os.getenv("SUMMARIZER_BACKEND", "pytorch")
+
+# Where exported ONNX models are kept between runs
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join("data", "onnx"))
+
+# ---------- JOB QUEUE ----------
+JOB_LEASE_SECONDS = _int("JOB_LEASE_SECONDS", 300)
+JOB_HEARTBEAT_SECONDS = _int("JOB_HEARTBEAT_SECONDS", 60)
+JOB_MAX_ATTEMPTS = _int("JOB_MAX_ATTEMPTS", 5)
+JOB_BACKOFF_BASE = _int("JOB_BACKOFF_BASE", 30)
+JOB_BACKOFF_MAX = _int("JOB_BACKOFF_MAX", 3600)
+JOB_POLL_SECONDS = _int("JOB_POLL_SECONDS", 5)
+
+# ---------- FAST MODE ----------
+# Fraction of sentences kept by the extractive pre-filter (0 = off)
+EXTRACTIVE_RATIO = float(os.getenv("EXTRACTIVE_RATIO", "0"))
+# Fraction kept when the user ticks "Fast mode" on the upload page
+FAST_MODE_RATIO = float(os.getenv("FAST_MODE_RATIO", "0.3"))
+
+# Sentences scored together when no chapter index is available
+EXTRACTIVE_WINDOW = _int("EXTRACTIVE_WINDOW", 200)
+
+# ---------- INFERENCE POOL ----------
+# Spawned inference workers sharing one copy of the weights (0 = off);
+# the pytorch backend shares its weights, int8 copies its packed weights
+# into each worker and onnx loads one session per worker
+SUMMARIZER_POOL_WORKERS = _int("SUMMARIZER_POOL_WORKERS", 0)
+
+# torch intra-op threads per pool worker
+SUMMARIZER_POOL_THREADS = _int(
+    "SUMMARIZER_POOL_THREADS",
+    max(1, (os.cpu_count() or 1) // max(SUMMARIZER_POOL_WORKERS, 1))
+)
+
+# ---------- INFERENCE SERVER ----------
+# e.g. http://127.0.0.1:8765 or unix:///tmp/summarizer.sock (empty = in-process)
+SUMMARIZER_SERVER_URL = os.getenv("SUMMARIZER_SERVER_URL", "")
+SERVER_MAX_BATCH_SIZE = _int("SERVER_MAX_BATCH_SIZE", 16)
+SERVER_MAX_WAIT_MS = _int("SERVER_MAX_WAIT_MS", 50)
+SERVER_TIMEOUT = _int("SERVER_TIMEOUT", 600)
+
+# ---------- EXTRACTION ----------
+# Processes used for PDF page extraction (1 = sequential); uploads and
+# GridFS streams are spooled to a temporary file the processes reopen
+PDF_WORKERS = _int("PDF_WORKERS", min(4, os.cpu_count() or 1))
+
+# Pages per parallel task; memory holds about 2 x workers windows
+PDF_WINDOW_PAGES = _int("PDF_WINDOW_PAGES", 16)
+
+# Measured extractor speeds written by scripts/benchmark_extractors.py --save
+EXTRACTOR_BENCHMARK_FILE = os.getenv(
+    "EXTRACTOR_BENCHMARK_FILE", os.path.join("data", "extractor_benchmark.json")
+)
+
+# Encoding detection: stop sampling once chardet is this confident
+ENCODING_CONFIDENCE = float(os.getenv("ENCODING_CONFIDENCE", "0.9"))
+
+# ---------- EXTRACTION CACHE ----------
+EXTRACTION_CACHE_MAX_ENTRIES = _int("EXTRACTION_CACHE_MAX_ENTRIES", 32)
+EXTRACTION_CACHE_TTL = _int("EXTRACTION_CACHE_TTL", 30 * 24 * 3600)
+EXTRACTION_CACHE_DB_MAX_ENTRIES = _int("EXTRACTION_CACHE_DB_MAX_ENTRIES", 5000)
+
+# Larger texts stay out of the MongoDB tier (16 MB document limit)
+EXTRACTION_CACHE_MAX_DB_CHARS = _int("EXTRACTION_CACHE_MAX_DB_CHARS", 4_000_000)
+
+# ---------- LARGE BOOKS ----------
+# Uploads above this go to GridFS and are stored as compressed text blocks
+LARGE_FILE_THRESHOLD_MB = _int("LARGE_FILE_THRESHOLD_MB", 10)
+MAX_UPLOAD_MB = _int("MAX_UPLOAD_MB", 500)
+
+# Characters of cleaned text per compressed block
+TEXT_BLOCK_CHARS = _int("TEXT_BLOCK_CHARS", 1_000_000)
+
+# ---------- LANGUAGE DETECTION ----------
+# Windows of this many characters are sampled across the text
+LANGDETECT_SAMPLES = _int("LANGDETECT_SAMPLES", 5)
+LANGDETECT_SAMPLE_CHARS = _int("LANGDETECT_SAMPLE_CHARS", 2000)
+
+# Fixed langdetect seed so the same text always gets the same answer
+LANGDETECT_SEED = _int("LANGDETECT_SEED", 0)
+
+# ---------- SENTENCE SEGMENTATION ----------
+# "punkt" (nltk) or "regex" (compiled rules, no model to load)
+SEGMENTER = os.getenv("SEGMENTER", "punkt")
+
+# Long texts are cut at paragraph boundaries into blocks of about this
+# many characters and segmented in parallel (1 worker = in-process)
+SEGMENT_WORKERS = _int("SEGMENT_WORKERS", min(4, os.cpu_count() or 1))
+SEGMENT_BLOCK_CHARS = _int("SEGMENT_BLOCK_CHARS", 200_000)
+
+# ---------- BOOK STRUCTURE ----------
+# Headings with less text than this before the next one (table of
+# contents lines, "Part I" right above "Chapter 1") don't open a chapter
+CHAPTER_MIN_CHARS = _int("CHAPTER_MIN_CHARS", 2000)
+
+# ---------- VERSIONING ----------
+# "content": content-defined chunk boundaries, so an edited version of a
+# book reuses the summaries of its unchanged chunks (~15% more chunks);
+# "tokens": fill every chunk to the model window (boundaries shift on
+# edits, so revisions reuse little). Every version of a book must be
+# chunked the same way for its summaries to be reused.
+CHUNK_STRATEGY = os.getenv("CHUNK_STRATEGY", "content")
@@ -1,5 +1,8 @@
 import streamlit as st
-from utils.database import get_books, get_summary,delete_book
+from utils.database import get_books, get_summaries,delete_book, get_chapter_summaries
+from utils.full_summary import summary_variants
+from utils.post_processing import STYLES
+from scripts.process_book import enqueue_chapter
 
 def show_history_page(user_id):
     st.header("📚 History")
@@ -27,8 +30,61 @@ def show_history_page(user_id):
                 st.success("Book deleted successfully")
                 st.rerun()
 
-        # SUMMARY
-        summary = get_summary(book["_id"])
-        if summary:
+        # SUMMARY (latest of each length / style)
+        variants = {}
+        for s in get_summaries(book["_id"]):
+            variants.setdefault((s.get("summary_length", "medium"), s.get("summary_style", "simple")), s)
+
+        if variants:
             st.subheader("📝 Summary")
-            st.write(summary["summary"])
+            summary = st.selectbox(
+                "Variant",
+                list(variants.values()),
+                format_func=lambda s: f"{s.get('summary_length', 'medium')} · {s.get('summary_style', 'simple')}",
+                key=f"variant_{book['_id']}"
+            ) if len(variants) > 1 else next(iter(variants.values()))
+            st.write(summary.get("summary_text") or summary.get("summary"))
+
+            # other lengths / styles: only the final reduce step runs again
+            c1, c2, c3 = st.columns([2, 2, 1])
+            with c1:
+                lengths = st.multiselect("📏 Lengths", ["short", "medium", "long"],
+                                         key=f"lengths_{book['_id']}")
+            with c2:
+                styles = st.multiselect("🎨 Styles", list(STYLES), default=["simple"],
+                                        key=f"styles_{book['_id']}")
+            with c3:
+                if st.button("✨ Create", key=f"create_variants_{book['_id']}"):
+                    latest = max(variants.values(), key=lambda s: s["created_at"])
+                    try:
+                        with st.spinner("🧩 Re-running the final summary step..."):
+                            created = summary_variants(book["_id"], user_id, latest,
+                                                       lengths or ["medium"], styles or ["simple"])
+                    except ValueError as e:
+                        st.error(str(e))
+                    else:
+                        st.success(f"Created {len(created)} variant(s)")
+                        st.rerun()
+
+        # CHAPTERS
+        chapters = book.get("chapters") or []
+        if chapters:
+            st.subheader(f"📑 Chapters ({len(chapters)})")
+            done = {s["chapter_index"]: s for s in get_chapter_summaries(book["_id"])}
+            for chapter in chapters:
+                chapter_summary = done.get(chapter["index"])
+                c1, c2 = st.columns([4, 1])
+                with c1:
+                    st.markdown(f"**{chapter['title']}**")
+                    if chapter_summary:
+                        st.write(chapter_summary["summary_text"])
+                    else:
+                        st.caption("Not summarized yet")
+                with c2:
+                    if st.button("🔁 Re-summarize", key=f"chap_{book['_id']}_{chapter['index']}"):
+                        enqueue_chapter(
+                            book["_id"], user_id, chapter["index"],
+                            summary_length=(chapter_summary or {}).get("summary_length", "medium"),
+                            summary_style=(chapter_summary or {}).get("summary_style", "simple")
+                        )
+                        st.success("📥 Chapter queued. The book summary updates when it finishes.")
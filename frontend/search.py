@@ -12,7 +12,7 @@ def show_search_page(user_id):
     with col2:
         status = st.selectbox(
             "📌 Status",
-            ["", "uploaded", "summarized"]
+            ["", "uploaded", "processing", "completed", "summarized", "failed"]
         )
 
     if st.button("Search", use_container_width=True):
@@ -1,34 +1,24 @@
 import streamlit as st
-from docx import Document
-import PyPDF2
 
-from utils.full_summary import summarize_large_text
+from backend.extraction_cache import extract_text_cached
+from backend.structure import detect_chapters
+from utils.full_summary import summarize_book_stream, reusable_chunks
+from utils.summarizer import summarizer_status
+from utils.summary_cache import cache_stats
+from scripts.process_book import enqueue_book
+from config.settings import (
+    EXTRACTIVE_RATIO, FAST_MODE_RATIO, LARGE_FILE_THRESHOLD_MB, MAX_UPLOAD_MB
+)
+from utils.book_storage import ingest_large_book
 from utils.database import (
     create_book,
-    save_summary,
+    add_book_version,
+    get_books,
+    get_summary,
     update_book_status
 )
 
-MAX_FILE_SIZE_MB = 10
-
-
-# ---------- TEXT EXTRACTORS ----------
-def extract_text_from_txt(file):
-    return file.getvalue().decode("utf-8", errors="ignore")
-
-
-def extract_text_from_pdf(file):
-    reader = PyPDF2.PdfReader(file)
-    text = ""
-    for page in reader.pages:
-        if page.extract_text():
-            text += page.extract_text() + "\n"
-    return text
-
-
-def extract_text_from_docx(file):
-    doc = Document(file)
-    return "\n".join(p.text for p in doc.paragraphs)
+MAX_FILE_SIZE_MB = MAX_UPLOAD_MB
 
 
 # ---------- UPLOAD PAGE ----------
@@ -39,13 +29,51 @@ def show_upload_page(user_id):
 
     st.header("📤 Upload Book")
 
+    model_status = summarizer_status()
+    pool = model_status.get("pool")
+    if pool:
+        if pool["broken"]:
+            st.caption(f"🔴 Inference worker died ({pool['broken']}); "
+                       "the pool restarts on the next summary")
+        else:
+            st.caption(f"🟢 Inference pool ready ({pool['workers']} workers × "
+                       f"{pool['threads_per_worker']} threads, {pool['queued']} batches queued)")
+        with st.expander("⚙️ Worker utilization"):
+            for w in pool["per_worker"]:
+                st.progress(
+                    min(w["utilization"], 1.0),
+                    text=(f"{'🟢' if w['alive'] else '🔴'} Worker {w['worker']}: "
+                          f"{w['batches']} batches, {w['busy_s']}s busy "
+                          f"({w['utilization']:.0%})")
+                )
+    elif model_status["state"] == "warm":
+        st.caption(f"🟢 Model ready (loaded in {model_status['load_time_s']}s)")
+    elif model_status["loading"]:
+        st.caption("🟡 Model is warming up...")
+    else:
+        st.caption("⚪ Model will load on first summary")
+
     uploaded_file = st.file_uploader(
-        "Upload TXT / PDF / DOCX (Max 10 MB)",
+        f"Upload TXT / PDF / DOCX (Max {MAX_FILE_SIZE_MB} MB)",
         type=["txt", "pdf", "docx"]
     )
 
+    previous = st.selectbox(
+        "🔁 Revised manuscript of (optional)",
+        [None] + [b for b in get_books(user_id, {"title": 1, "version": 1, "text_storage": 1})
+                  if b.get("text_storage") != "blocks"],
+        format_func=lambda b: "— new book —" if b is None
+        else f"{b['title']} (v{b.get('version', 1)})"
+    )
     title = st.text_input("📘 Book Title")
     author = st.text_input("✍️ Author (optional)")
+    summary_length = st.selectbox("📏 Summary length", ["short", "medium", "long"], index=1)
+    fast_mode = st.checkbox(
+        f"⚡ Fast mode (summarize only the most important ~{FAST_MODE_RATIO:.0%} of sentences)"
+    )
+    background = st.checkbox(
+        "⏳ Process in background (check progress on the History page)"
+    )
 
     extracted_text = None
 
@@ -54,50 +82,100 @@ def show_upload_page(user_id):
         file_size_mb = uploaded_file.size / (1024 * 1024)
 
         if file_size_mb > MAX_FILE_SIZE_MB:
-            st.error("❌ File size must be less than 10 MB")
+            st.error(f"❌ File size must be less than {MAX_FILE_SIZE_MB} MB")
             return
 
-        try:
-            if uploaded_file.name.endswith(".txt"):
-                extracted_text = extract_text_from_txt(uploaded_file)
+        if file_size_mb > LARGE_FILE_THRESHOLD_MB:
+            show_large_upload(user_id, uploaded_file, title, author,
+                              summary_length, fast_mode)
+            return
 
-            elif uploaded_file.name.endswith(".pdf"):
-                extracted_text = extract_text_from_pdf(uploaded_file)
+        # same extraction + cleaning as the backend, straight from the
+        # upload buffer; reruns and repeat uploads hit the content-hash cache
+        result = extract_text_cached(uploaded_file)
+        if result["status"] == "error":
+            st.error(f"File reading error: {result['message']}")
+            return
 
-            elif uploaded_file.name.endswith(".docx"):
-                extracted_text = extract_text_from_docx(uploaded_file)
+        extracted_text = result["text"]
+        empty_pages = result["metadata"].get("empty_pages")
 
-            st.success("✅ File uploaded successfully")
+        st.success("✅ File uploaded successfully")
+        if empty_pages:
+            st.warning(f"⚠️ No text found on page(s): {', '.join(map(str, empty_pages[:20]))}")
 
-            st.text_area(
-                "📄 File Preview (first 1000 characters)",
-                extracted_text[:1000],
-                height=200
-            )
-
-        except Exception as e:
-            st.error(f"File reading error: {e}")
-            return
+        st.text_area(
+            "📄 File Preview (first 1000 characters)",
+            extracted_text[:1000],
+            height=200
+        )
 
     # ---------- GENERATE SUMMARY ----------
     if st.button("🚀 Generate Summary", use_container_width=True):
 
-        if not uploaded_file or not title or not extracted_text:
+        if not uploaded_file or not (title or previous) or not extracted_text:
             st.warning("Please upload file and enter book title")
             return
 
-        with st.spinner("🤖 Generating AI summary..."):
-            summary = summarize_large_text(extracted_text)
+        # Save book first so every summary level is stored against it
+        chapters = detect_chapters(extracted_text)
+        reuse = None
+        if previous:
+            # unchanged chunks reuse the previous version's summaries
+            book_id = previous["_id"]
+            reuse = reusable_chunks(get_summary(book_id))
+            version = add_book_version(book_id, extracted_text, chapters)
+            st.caption(f"📚 Saved as version {version} of {previous['title']}")
+        else:
+            book_id = create_book(
+                user_id=user_id,
+                title=title,
+                text=extracted_text,
+                author=author,
+                chapters=chapters
+            )
 
-        # Save book + summary
-        book_id = create_book(
-            user_id=user_id,
-            title=title,
-            text=extracted_text,
-            author=author
-        )
+        if background:
+            enqueue_book(book_id, user_id, summary_length=summary_length,
+                         extractive_ratio=FAST_MODE_RATIO if fast_mode else None)
+            st.success("📥 Book queued for summarization. Check History for status.")
+            if chapters:
+                st.caption(f"📑 {len(chapters)} chapters detected, summarized one job each")
+            return
 
-        save_summary(book_id, user_id, summary)
+        # Stream chunk summaries so partial results show up right away
+        progress = st.progress(0.0, text="🤖 Starting summarization...")
+        partial = st.empty()
+        parts = []
+        summary = ""
+
+        reused = 0
+        for event in summarize_book_stream(
+            book_id, user_id, extracted_text, summary_length=summary_length,
+            extractive_ratio=FAST_MODE_RATIO if fast_mode else EXTRACTIVE_RATIO, reuse=reuse
+        ):
+            if event["done"]:
+                summary = event["summary"]
+                reused = event["reused"]
+                break
+
+            parts.append(event["summary"])
+            progress.progress(
+                event["index"] / event["total"],
+                text=(
+                    f"🤖 Chunk {event['index']}/{event['total']} · "
+                    f"{event['elapsed']:.0f}s elapsed · ~{event['eta']:.0f}s left"
+                )
+            )
+            if event["index"] == event["total"]:
+                progress.progress(1.0, text="🧩 Combining chunk summaries...")
+
+            with partial.container():
+                st.caption("Partial summary (updates as chunks finish)")
+                st.write(" ".join(parts))
+
+        progress.empty()
+        partial.empty()
 
         # ✅ Update status to summarized
         update_book_status(book_id, "summarized")
@@ -105,9 +183,53 @@ def show_upload_page(user_id):
         st.success("🎉 Summary generated successfully")
         st.balloons()   # 🎈 Celebration effect
 
+        if reused:
+            st.caption(f"♻️ Reused {reused} chunk summaries from the previous version")
+
+        stats = cache_stats()
+        st.caption(
+            f"🗃 Chunk cache: {stats['memory_hits'] + stats['persistent_hits']} hits, "
+            f"{stats['misses']} misses (hit rate {stats['hit_rate']:.0%})"
+        )
+
         st.subheader("📑 Generated Summary")
         st.text_area(
             "Summary",
             summary,
             height=300
         )
+
+
+
+# ---------- LARGE BOOKS ----------
+def show_large_upload(user_id, uploaded_file, title, author, summary_length, fast_mode):
+    """Books above LARGE_FILE_THRESHOLD_MB go to GridFS, are extracted
+    incrementally into compressed blocks and always summarize in background."""
+    st.info(
+        f"📦 Large book ({uploaded_file.size / (1024 * 1024):.0f} MB): it will be "
+        "stored in chunks and summarized in the background."
+    )
+
+    if not st.button("🚀 Upload & Queue Summary", use_container_width=True):
+        return
+
+    if not title:
+        st.warning("Please enter book title")
+        return
+
+    file_type = uploaded_file.name.split(".")[-1].lower()
+
+    try:
+        with st.spinner("📥 Storing and extracting text..."):
+            book_id, preview = ingest_large_book(
+                user_id, title, author, uploaded_file, uploaded_file.name, file_type
+            )
+    except Exception as e:
+        st.error(f"File reading error: {e}")
+        return
+
+    enqueue_book(book_id, user_id, summary_length=summary_length,
+                 extractive_ratio=FAST_MODE_RATIO if fast_mode else None)
+
+    st.success("📥 Book stored and queued for summarization. Check History for status.")
+    st.text_area("📄 File Preview (first 1000 characters)", preview, height=200)
@@ -3,6 +3,9 @@ from frontend.auth import show_auth_page
 from frontend.upload import show_upload_page
 from frontend.history import show_history_page
 from frontend.search import show_search_page
+from config.settings import SUMMARIZER_WARMUP
+from utils.summarizer import warm_up
+
 st.set_page_config(
     page_title="AI Book Summarization",
     layout="centered",
@@ -11,6 +14,17 @@ st.set_page_config(
 
 #st.set_page_config("AI Book Platform", layout="wide")
 
+# load the summarizer in the background so the first upload starts warm;
+# once per process, not on every rerun, so the idle unload can stick
+@st.cache_resource
+def _warm_up_once():
+    warm_up()
+    return True
+
+
+if SUMMARIZER_WARMUP:
+    _warm_up_once()
+
 if "logged_in" not in st.session_state:
     st.session_state.logged_in = False
 
@@ -1,5 +1,6 @@
 # models/book.py
 from datetime import datetime
+from backend.structure import detect_chapters
 from utils.database import create_book, update_book_status, get_book_by_id
 
 class Book:
@@ -7,6 +8,9 @@ class Book:
         self.user_id = user_id
         self.title = title
         self.author = author
+        # chapter index: [{"index", "title", "level", "start", "end"}, ...]
+        if chapter is None and raw_text:
+            chapter = detect_chapters(raw_text)
         self.chapter = chapter
         self.file_path = file_path
         self.raw_text = raw_text
@@ -18,9 +22,8 @@ class Book:
             self.user_id,
             self.title,
             self.author,
-            self.chapter,
-            self.file_path,
-            self.raw_text
+            self.raw_text,
+            chapters=self.chapter
         )
 
     @staticmethod
@@ -0,0 +1,70 @@
+# scripts/bench_common.py
+# Helpers shared by the benchmark scripts in this folder.
+import os
+import random
+import resource
+import sys
+import time
+
+# Add project root folder to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_VOCAB = (
+    "the a an of to in and that was for on with as his her it he she they "
+    "book chapter story river city king queen soldier letter house garden "
+    "war peace winter summer morning night journey secret promise family "
+    "walked spoke wrote found lost remembered believed carried watched "
+    "quietly slowly suddenly finally together alone again never always"
+).split()
+
+
+def sample_corpus(words=10000, seed=42, paragraph_sentences=8):
+    """Deterministic book-like text: same seed, same text on every run."""
+    rng = random.Random(seed)
+    out = []
+    sentences = []
+    count = 0
+    while count < words:
+        n = rng.randint(8, 24)
+        sent = " ".join(rng.choice(_VOCAB) for _ in range(n))
+        sentences.append(sent[0].upper() + sent[1:] + ".")
+        count += n
+        if len(sentences) == paragraph_sentences:
+            out.append(" ".join(sentences))
+            sentences = []
+    if sentences:
+        out.append(" ".join(sentences))
+    return "\n".join(out)
+
+
+def load_corpus(path=None, words=10000):
+    if path:
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    return sample_corpus(words)
+
+
+def peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def timed(fn, *args, repeat=1, **kwargs):
+    """Run fn ``repeat`` times; return (best seconds, last result)."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def print_table(rows, columns):
+    widths = [max(len(c), *(len(str(r.get(c, ""))) for r in rows)) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in rows:
+        print("  ".join(str(r.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
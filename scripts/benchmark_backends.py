@@ -0,0 +1,83 @@
+# scripts/benchmark_backends.py
+"""Compare summarizer inference backends on a fixed corpus.
+
+Each backend runs in its own process so peak RSS is measured in isolation.
+
+    python scripts/benchmark_backends.py --backends pytorch int8 onnx
+"""
+import argparse
+import multiprocessing
+import os
+import statistics
+import time
+
+from bench_common import load_corpus, peak_rss_mb, print_table
+
+
+def _run_backend(backend, text, batch_size, queue):
+    # must be set before utils.summarizer reads the settings
+    os.environ["SUMMARIZER_BACKEND"] = backend
+    os.environ["SUMMARIZER_WARMUP"] = "0"
+
+    from utils.chunking import chunk_by_tokens
+    from utils.summarizer import generate_summaries, model_manager
+
+    chunks = chunk_by_tokens(text)
+    tokens = sum(c["token_count"] for c in chunks)
+
+    start = time.perf_counter()
+    model_manager.get()
+    load_time = time.perf_counter() - start
+
+    # one warm-up batch so lazy kernel initialisation is not timed
+    generate_summaries(chunks[:1], batch_size=1)
+
+    latencies = []
+    start = time.perf_counter()
+    for i in range(0, len(chunks), batch_size):
+        batch = chunks[i:i + batch_size]
+        t0 = time.perf_counter()
+        generate_summaries(batch, batch_size=batch_size)
+        latencies.append((time.perf_counter() - t0) / len(batch))
+    total = time.perf_counter() - start
+
+    queue.put({
+        "backend": backend,
+        "chunks": len(chunks),
+        "load_s": round(load_time, 1),
+        "latency_ms/chunk": round(statistics.mean(latencies) * 1000),
+        "p95_ms/chunk": round(sorted(latencies)[int(0.95 * (len(latencies) - 1))] * 1000),
+        "chunks/s": round(len(chunks) / total, 2),
+        "tokens/s": round(tokens / total),
+        "peak_rss_mb": round(peak_rss_mb()),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=["pytorch", "int8", "onnx"])
+    parser.add_argument("--corpus", help="text file to summarize (default: built-in corpus)")
+    parser.add_argument("--words", type=int, default=6000)
+    parser.add_argument("--batch-size", type=int, default=4)
+    args = parser.parse_args()
+
+    text = load_corpus(args.corpus, args.words)
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+
+    for backend in args.backends:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_run_backend, args=(backend, text, args.batch_size, queue))
+        proc.start()
+        proc.join()
+        if proc.exitcode != 0:
+            rows.append({"backend": backend, "chunks": "failed"})
+            continue
+        rows.append(queue.get())
+
+    print_table(rows, ["backend", "chunks", "load_s", "latency_ms/chunk",
+                       "p95_ms/chunk", "chunks/s", "tokens/s", "peak_rss_mb"])
+
+
+if __name__ == "__main__":
+    main()
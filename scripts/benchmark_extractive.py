@@ -0,0 +1,62 @@
+# scripts/benchmark_extractive.py
+"""Measure the speedup of the extractive pre-filter (fast mode).
+
+Without --summarize, model calls are estimated from the chunk count;
+with it, both paths run through the real summarizer.
+
+    python scripts/benchmark_extractive.py --words 100000 --ratios 0.2 0.3 0.5
+"""
+import argparse
+
+from bench_common import load_corpus, print_table, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="text file (default: built-in corpus)")
+    parser.add_argument("--words", type=int, default=100000)
+    parser.add_argument("--ratios", type=float, nargs="+", default=[0.2, 0.3, 0.5])
+    parser.add_argument("--method", default="textrank", choices=["textrank", "tfidf"])
+    parser.add_argument("--summarize", action="store_true",
+                        help="run the abstractive model on both paths")
+    args = parser.parse_args()
+
+    from utils.chunking import chunk_by_tokens
+    from utils.extractive import extractive_filter
+
+    text = load_corpus(args.corpus, args.words)
+    base_chunks = len(chunk_by_tokens(text))
+    rows = [{"ratio": "1.0 (off)", "filter_s": 0, "chunks": base_chunks, "est_speedup": "1.0x"}]
+
+    base_time = None
+    if args.summarize:
+        from utils.full_summary import map_reduce_summarize
+        from utils.summary_cache import summary_cache
+
+        # measure inference, not cache hits from an earlier run
+        summary_cache.persistent = None
+        base_time, _ = timed(map_reduce_summarize, text, extractive_ratio=0)
+        rows[0]["summarize_s"] = round(base_time, 1)
+        rows[0]["speedup"] = "1.0x"
+
+    for ratio in args.ratios:
+        filter_time, filtered = timed(extractive_filter, text, ratio, method=args.method)
+        chunks = len(chunk_by_tokens(filtered))
+        row = {
+            "ratio": ratio,
+            "filter_s": round(filter_time, 2),
+            "chunks": chunks,
+            "est_speedup": f"{base_chunks / max(chunks, 1):.1f}x",
+        }
+        if args.summarize:
+            summary_cache.memory.clear()
+            total, _ = timed(map_reduce_summarize, text, extractive_ratio=ratio)
+            row["summarize_s"] = round(total, 1)
+            row["speedup"] = f"{base_time / total:.1f}x"
+        rows.append(row)
+
+    print_table(rows, ["ratio", "filter_s", "chunks", "est_speedup", "summarize_s", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# scripts/benchmark_extractors.py
+"""Measure pages/second and memory of every installed extractor backend.
+
+Each (file, backend) run happens in a fresh process so the peak RSS
+increase belongs to that backend alone. With --save, averaged speeds are
+written to EXTRACTOR_BENCHMARK_FILE and extract_text() ranks backends by
+them from then on.
+
+    python scripts/benchmark_extractors.py samples/book.pdf samples/book.docx --save
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+
+from bench_common import peak_rss_mb, print_table
+
+
+def _run(file_path, backend_name, repeat, queue):
+    from backend.extractor_registry import get_extractor
+    import backend.text_extractor  # noqa: F401  registers the backends
+
+    ext = file_path.rsplit(".", 1)[-1].lower()
+    extractor = get_extractor(ext, name=backend_name)
+    baseline = peak_rss_mb()
+
+    best = None
+    report = {}
+    for _ in range(repeat):
+        report = {}
+        start = time.perf_counter()
+        text = extractor(file_path, report=report)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    pages = report.get("page_count") or 1
+    queue.put({
+        "file": os.path.basename(file_path),
+        "type": ext,
+        "backend": backend_name,
+        "ok": not text.startswith("ERROR"),
+        "pages": pages,
+        "seconds": round(best, 3),
+        "pages_per_s": round(pages / best, 1) if best else 0.0,
+        "chars": len(text),
+        "peak_mem_mb": round(peak_rss_mb() - baseline, 1),
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("files", nargs="+")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--save", action="store_true")
+    args = parser.parse_args()
+
+    from backend.extractor_registry import available_extractors
+    import backend.text_extractor  # noqa: F401
+    from config.settings import EXTRACTOR_BENCHMARK_FILE
+
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    for file_path in args.files:
+        ext = file_path.rsplit(".", 1)[-1].lower()
+        for extractor in available_extractors(ext):
+            queue = ctx.Queue()
+            proc = ctx.Process(target=_run, args=(file_path, extractor.name, args.repeat, queue))
+            proc.start()
+            proc.join()
+            if proc.exitcode == 0:
+                rows.append(queue.get())
+            else:
+                rows.append({"file": os.path.basename(file_path), "type": ext,
+                             "backend": extractor.name, "ok": False})
+
+    print_table(rows, ["file", "type", "backend", "ok", "pages", "seconds",
+                       "pages_per_s", "chars", "peak_mem_mb"])
+
+    if args.save:
+        grouped = defaultdict(lambda: defaultdict(list))
+        for r in rows:
+            if r.get("ok"):
+                grouped[r["type"]][r["backend"]].append(r)
+        results = {
+            file_type: {
+                name: {
+                    "pages_per_s": round(sum(r["pages_per_s"] for r in runs) / len(runs), 1),
+                    "peak_mem_mb": max(r["peak_mem_mb"] for r in runs),
+                }
+                for name, runs in backends.items()
+            }
+            for file_type, backends in grouped.items()
+        }
+        os.makedirs(os.path.dirname(EXTRACTOR_BENCHMARK_FILE) or ".", exist_ok=True)
+        with open(EXTRACTOR_BENCHMARK_FILE, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nSaved to {EXTRACTOR_BENCHMARK_FILE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# scripts/benchmark_langdetect.py
+"""Compare full-text langdetect with sampled, cached detection.
+
+"distinct" is the number of different answers over --repeat runs; the
+full-text path is run unseeded, as before.
+
+    python scripts/benchmark_langdetect.py --words 1000000 --repeat 5
+"""
+import argparse
+
+from bench_common import load_corpus, print_table, timed
+
+
+def full_text_detect(text):
+    from langdetect import DetectorFactory, detect
+
+    DetectorFactory.seed = None
+    try:
+        return detect(text)
+    except Exception:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="text file (default: built-in corpus)")
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    from backend import preprocessing
+    from backend.preprocessing import clean_text, detect_language
+
+    text = clean_text(load_corpus(args.corpus, args.words))
+
+    def runs(fn, clear=False):
+        answers = set()
+        best = None
+        for _ in range(args.repeat):
+            if clear:
+                preprocessing._language_cache.clear()
+            elapsed, lang = timed(fn, text)
+            best = elapsed if best is None else min(best, elapsed)
+            answers.add(lang)
+        return best, answers
+
+    full_time, full_answers = runs(full_text_detect)
+    # full_text_detect unset the seed; restore the configured one
+    from langdetect import DetectorFactory
+    DetectorFactory.seed = preprocessing.LANGDETECT_SEED
+
+    cold_time, cold_answers = runs(detect_language, clear=True)
+    warm_time, warm_answers = runs(detect_language)
+
+    rows = [
+        {"mode": "full text", "ms": round(full_time * 1000, 1),
+         "language": ",".join(sorted(full_answers)), "distinct": len(full_answers)},
+        {"mode": "sampled (cold)", "ms": round(cold_time * 1000, 1),
+         "language": ",".join(sorted(cold_answers)), "distinct": len(cold_answers),
+         "speedup": f"{full_time / cold_time:.1f}x"},
+        {"mode": "sampled (cached)", "ms": round(warm_time * 1000, 3),
+         "language": ",".join(sorted(warm_answers)), "distinct": len(warm_answers),
+         "speedup": f"{full_time / warm_time:.0f}x"},
+    ]
+    print(f"{args.words:,} words")
+    print_table(rows, ["mode", "ms", "language", "distinct", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
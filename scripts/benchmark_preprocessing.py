@@ -0,0 +1,98 @@
+# scripts/benchmark_preprocessing.py
+"""Compare the old three-pass preprocessing with the single-pass engine.
+
+Language detection is left out of both timings; it is the same call on
+both paths. The legacy pipeline packs --chunk-size words; the engine packs
+model tokens (the summarizer's window) so every chunk fits the model, which
+includes tokenizing each sentence once.
+
+    python scripts/benchmark_preprocessing.py --words 1000000 --overlap 150 500
+"""
+import argparse
+
+from bench_common import load_corpus, print_table, timed
+
+
+def legacy_preprocess(text, chunk_size=1000, overlap=150):
+    """The pre-engine pipeline: sent_tokenize three times, quadratic overlap."""
+    from nltk.tokenize import sent_tokenize
+
+    sentences = sent_tokenize(text)
+
+    words = text.split()
+    stats_sentences = sent_tokenize(text)
+    stats = {"word_count": len(words), "sentence_count": len(stats_sentences)}
+
+    chunks = []
+    current_chunk = []
+    current_words = 0
+    for sent in sent_tokenize(text):
+        sent_words = len(sent.split())
+        if current_words + sent_words > chunk_size:
+            chunks.append(" ".join(current_chunk))
+            overlap_words = []
+            count = 0
+            for s in reversed(current_chunk):
+                overlap_words.insert(0, s)
+                count += len(s.split())
+                if count >= overlap:
+                    break
+            current_chunk = overlap_words + [sent]
+            current_words = sum(len(s.split()) for s in current_chunk)
+        else:
+            current_chunk.append(sent)
+            current_words += sent_words
+    if current_chunk:
+        chunks.append(" ".join(current_chunk))
+
+    return sentences, stats, chunks
+
+
+def engine_preprocess(text, overlap=150):
+    from backend.preprocessing import (
+        calculate_text_stats, chunk_spans, segment_spans, sentence_word_counts
+    )
+    from utils.chunking import get_tokenizer, token_budget, token_spans
+
+    spans = segment_spans(text)
+    counts = sentence_word_counts(text, spans)
+    stats = calculate_text_stats(text, spans, counts)
+    tokenizer = get_tokenizer()
+    budget = token_budget(tokenizer)
+    pieces = token_spans(text, spans, tokenizer, budget)
+    return spans, stats, chunk_spans([(s, e) for s, e, _ in pieces],
+                                     [n for _, _, n in pieces], budget, overlap)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="text file (default: built-in corpus)")
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="words per legacy chunk")
+    parser.add_argument("--overlap", type=int, nargs="+", default=[150, 500],
+                        help="words (legacy) / tokens (engine)")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from backend.preprocessing import clean_text
+
+    text = clean_text(load_corpus(args.corpus, args.words))
+
+    rows = []
+    for overlap in args.overlap:
+        old_time, (_, old_stats, old_chunks) = timed(
+            legacy_preprocess, text, args.chunk_size, overlap, repeat=args.repeat)
+        new_time, (_, new_stats, new_chunks) = timed(
+            engine_preprocess, text, overlap, repeat=args.repeat)
+        rows.append({"pipeline": "legacy", "overlap": overlap, "seconds": round(old_time, 2),
+                     "sentences": old_stats["sentence_count"], "chunks": len(old_chunks)})
+        rows.append({"pipeline": "single-pass", "overlap": overlap, "seconds": round(new_time, 2),
+                     "sentences": new_stats["sentence_count"], "chunks": len(new_chunks),
+                     "speedup": f"{old_time / new_time:.1f}x"})
+
+    print(f"{len(text.split()):,} words")
+    print_table(rows, ["pipeline", "overlap", "seconds", "sentences", "chunks", "speedup"])
+
+
+if __name__ == "__main__":
+    main()
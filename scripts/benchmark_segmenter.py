@@ -0,0 +1,48 @@
+# scripts/benchmark_segmenter.py
+"""Sentences per second for each segmenter backend and worker count.
+
+"same" checks the spans against the single-worker run of that backend.
+
+    python scripts/benchmark_segmenter.py --words 1000000 --workers 1 2 4
+"""
+import argparse
+
+from bench_common import load_corpus, print_table, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--corpus", help="text file (default: built-in corpus)")
+    parser.add_argument("--words", type=int, default=1000000)
+    parser.add_argument("--backends", nargs="+", help="default: all installed")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from backend.preprocessing import clean_text
+    from backend.segmenter import available_segmenters, segment_spans
+
+    text = clean_text(load_corpus(args.corpus, args.words))
+
+    rows = []
+    for name in args.backends or available_segmenters():
+        reference = None
+        for workers in args.workers:
+            seconds, spans = timed(segment_spans, text, name, workers, repeat=args.repeat)
+            if reference is None:
+                reference = spans
+            rows.append({
+                "backend": name,
+                "workers": workers,
+                "seconds": round(seconds, 2),
+                "sentences": len(spans),
+                "sent_per_s": f"{len(spans) / seconds:,.0f}",
+                "same": spans == reference,
+            })
+
+    print(f"{len(text):,} characters")
+    print_table(rows, ["backend", "workers", "seconds", "sentences", "sent_per_s", "same"])
+
+
+if __name__ == "__main__":
+    main()
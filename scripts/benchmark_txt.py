@@ -0,0 +1,77 @@
+# scripts/benchmark_txt.py
+"""Compare TXT extraction: full-file chardet + second read (old path) vs
+sampled incremental detection + single mmap decode (backend.txt_reader).
+
+    python scripts/benchmark_txt.py --mb 50
+    python scripts/benchmark_txt.py --file books/big.txt
+"""
+import argparse
+import os
+import tempfile
+
+import chardet
+
+from bench_common import sample_corpus, print_table, timed
+
+
+def old_extract(file_path):
+    with open(file_path, "rb") as f:
+        raw = f.read()
+        encoding = chardet.detect(raw)["encoding"] or "utf-8"
+    with open(file_path, "r", encoding=encoding, errors="ignore") as f:
+        return f.read()
+
+
+def _make_file(mb, encoding):
+    # accented words so detection has real work to do
+    text = sample_corpus(words=mb * 180000).replace(" river ", " rivière ") \
+                                         .replace(" summer ", " été ")
+    f = tempfile.NamedTemporaryFile("w", suffix=".txt", encoding=encoding, delete=False)
+    with f:
+        f.write(text)
+    return f.name
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--file")
+    parser.add_argument("--mb", type=int, default=20, help="size of generated files")
+    parser.add_argument("--encodings", nargs="+", default=["utf-8", "latin-1"])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    from backend.txt_reader import read_text_file
+
+    if args.file:
+        files = [(args.file, "?")]
+    else:
+        files = [(_make_file(args.mb, enc), enc) for enc in args.encodings]
+
+    rows = []
+    try:
+        for path, encoding in files:
+            size_mb = os.path.getsize(path) / (1024 * 1024)
+            old_s, old_text = timed(old_extract, path, repeat=args.repeat)
+            report = {}
+            new_s, new_text = timed(read_text_file, path, report, repeat=args.repeat)
+            rows.append({
+                "file": os.path.basename(path),
+                "written_as": encoding,
+                "size_mb": round(size_mb, 1),
+                "old_s": round(old_s, 2),
+                "new_s": round(new_s, 2),
+                "speedup": f"{old_s / new_s:.1f}x",
+                "detected": f"{report['encoding']} ({report['encoding_confidence']})",
+                "same_text": old_text == new_text,
+            })
+    finally:
+        if not args.file:
+            for path, _ in files:
+                os.unlink(path)
+
+    print_table(rows, ["file", "written_as", "size_mb", "old_s", "new_s",
+                       "speedup", "detected", "same_text"])
+
+
+if __name__ == "__main__":
+    main()
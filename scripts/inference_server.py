@@ -0,0 +1,57 @@
+# scripts/inference_server.py
+"""Run the cross-session batching inference server.
+
+    python scripts/inference_server.py --port 8765
+    python scripts/inference_server.py --unix-socket /tmp/summarizer.sock
+    python scripts/inference_server.py --stub        # no model, for testing
+
+Point the app at it with SUMMARIZER_SERVER_URL=http://127.0.0.1:8765
+(or unix:///tmp/summarizer.sock).
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Add project root folder to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import SERVER_MAX_BATCH_SIZE, SERVER_MAX_WAIT_MS
+from utils.inference_server import DynamicBatcher, StubModel, make_server, summarizer_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket")
+    parser.add_argument("--max-batch-size", type=int, default=SERVER_MAX_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=int, default=SERVER_MAX_WAIT_MS)
+    parser.add_argument("--stub", action="store_true", help="serve a stub model")
+    parser.add_argument("--stub-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.stub:
+        model_fn = StubModel(args.stub_delay)
+    else:
+        from utils.summarizer import model_manager
+        model_manager.warm_up(background=False)
+        model_fn = summarizer_model
+
+    batcher = DynamicBatcher(model_fn, args.max_batch_size, args.max_wait_ms)
+    server = make_server(batcher, args.host, args.port, args.unix_socket)
+    logging.info("Inference server listening on %s",
+                 args.unix_socket or f"http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        batcher.stop()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
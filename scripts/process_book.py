@@ -1,43 +1,213 @@
 # scripts/process_book.py
+import time
 
 from utils.database import (
-    create_summary,
     update_book_status,
-    get_book_by_id
+    get_book_by_id,
+    get_summary,
+    create_summary,
+    save_chapter_summary,
+    get_chapter_summaries,
+    start_chapter_run,
+    finish_chapter
+)
+from utils.book_storage import get_book_text, get_book_text_range, iter_book_text
+from utils.full_summary import (
+    summarize_book,
+    map_reduce_summarize,
+    map_reduce_blocks,
+    reduce_summaries,
+    reusable_chunks
 )
+from utils.job_queue import enqueue_job
+from config.settings import EXTRACTIVE_RATIO
 
+JOB_TYPE = "summarize_book"
+CHAPTER_JOB_TYPE = "summarize_chapter"
+COMBINE_JOB_TYPE = "combine_chapters"
 
-def process_book(book_id, user_id):
-    """Simple dummy processor function"""
+
+def process_book(book_id, user_id, summary_length="medium", summary_style="simple",
+                 extractive_ratio=None):
+    """Summarize a stored book: uploaded → processing → completed"""
 
     # 1. Book retrieve
     book = get_book_by_id(book_id)
     if not book:
-        print("Book not found")
-        return None
+        raise ValueError(f"Book not found: {book_id}")
 
     print(f"Processing book: {book['title']}")
 
     # 2. Update status → processing
     update_book_status(book_id, "processing")
 
-    # 3. Dummy summary (later LLM add karenge)
-    raw_text = book.get("raw_text", "")
-    summary_text = "This is a generated summary of the book."
+    # 3. Summarize (map-reduce) and store in database; chunks unchanged
+    #    since the previous version reuse their stored summaries
+    ratio = EXTRACTIVE_RATIO if extractive_ratio is None else extractive_ratio
+    reuse = reusable_chunks(get_summary(book_id))
+    if book.get("text_storage") == "blocks":
+        # block by block, so the whole book is never joined or tokenized at once
+        start = time.time()
+        result = map_reduce_blocks(iter_book_text(book), summary_length=summary_length,
+                                   extractive_ratio=ratio, reuse=reuse)
+        summary_id = create_summary(
+            book_id=book_id,
+            user_id=user_id,
+            summary_text=result["summary"],
+            summary_length=summary_length,
+            summary_style=summary_style,
+            chunk_summaries=result["chunk_summaries"],
+            processing_time=round(time.time() - start, 2)
+        )
+    else:
+        summary_id, _ = summarize_book(
+            book_id,
+            user_id,
+            get_book_text(book),
+            summary_length=summary_length,
+            summary_style=summary_style,
+            extractive_ratio=ratio,
+            reuse=reuse
+        )
+
+    # 4. Update status → completed
+    update_book_status(book_id, "completed")
+
+    print("Summary created:", summary_id)
+    return summary_id
+
+
+def enqueue_book(book_id, user_id, summary_length="medium", summary_style="simple",
+                 extractive_ratio=None, by_chapter=True):
+    """Queue a book for the background workers (scripts/worker.py).
+
+    Books with a chapter index get one job per chapter; returns job ids.
+    """
+    if by_chapter:
+        book = get_book_by_id(book_id)
+        if book and book.get("chapters"):
+            return enqueue_chapters(book_id, user_id, summary_length, summary_style,
+                                    extractive_ratio)
+
+    return [enqueue_job(JOB_TYPE, {
+        "book_id": str(book_id),
+        "user_id": str(user_id),
+        "summary_length": summary_length,
+        "summary_style": summary_style,
+        "extractive_ratio": extractive_ratio
+    })]
+
+
+# ---------- PER-CHAPTER ----------
+def enqueue_chapters(book_id, user_id, summary_length="medium", summary_style="simple",
+                     extractive_ratio=None, indexes=None):
+    """One job per chapter (all of them, or just ``indexes``). When the last
+    one finishes, a combine job rebuilds the book summary from the stored
+    chapter summaries."""
+    if indexes is None:
+        book = get_book_by_id(book_id)
+        if not book:
+            raise ValueError(f"Book not found: {book_id}")
+        indexes = [c["index"] for c in book.get("chapters") or []]
+
+    start_chapter_run(book_id, indexes, summary_length, summary_style)
+    return [
+        enqueue_job(CHAPTER_JOB_TYPE, {
+            "book_id": str(book_id),
+            "user_id": str(user_id),
+            "chapter_index": index,
+            "summary_length": summary_length,
+            "summary_style": summary_style,
+            "extractive_ratio": extractive_ratio
+        })
+        for index in indexes
+    ]
+
+
+def enqueue_chapter(book_id, user_id, chapter_index, summary_length="medium",
+                    summary_style="simple", extractive_ratio=None):
+    """Re-summarize a single chapter; the rest of the book is reused."""
+    return enqueue_chapters(book_id, user_id, summary_length, summary_style,
+                            extractive_ratio, indexes=[chapter_index])[0]
 
-    # 4. Create summary in database
+
+def process_chapter(book_id, user_id, chapter_index, summary_length="medium",
+                    summary_style="simple", extractive_ratio=None):
+    book = get_book_by_id(book_id)
+    if not book:
+        raise ValueError(f"Book not found: {book_id}")
+    chapters = book.get("chapters") or []
+    if not 0 <= chapter_index < len(chapters):
+        raise ValueError(f"Book {book_id} has no chapter {chapter_index}")
+    chapter = chapters[chapter_index]
+
+    print(f"Processing {book['title']} · {chapter['title']}")
+    update_book_status(book_id, "processing")
+
+    start = time.time()
+    text = get_book_text_range(book, chapter["start"], chapter["end"]).strip()
+    # chapters move between versions, so every stored chapter is a source
+    result = map_reduce_summarize(
+        text,
+        summary_length=summary_length,
+        extractive_ratio=EXTRACTIVE_RATIO if extractive_ratio is None else extractive_ratio,
+        reuse=reusable_chunks(*get_chapter_summaries(book_id, summary_length, summary_style))
+    )
+    summary_id = save_chapter_summary(
+        book_id,
+        user_id,
+        chapter,
+        result["summary"],
+        summary_length=summary_length,
+        summary_style=summary_style,
+        chunk_summaries=result["chunk_summaries"],
+        processing_time=round(time.time() - start, 2)
+    )
+
+    if finish_chapter(book_id, chapter_index, summary_length, summary_style):
+        enqueue_job(COMBINE_JOB_TYPE, {
+            "book_id": str(book_id),
+            "user_id": str(user_id),
+            "summary_length": summary_length,
+            "summary_style": summary_style
+        })
+    return summary_id
+
+
+def combine_chapters(book_id, user_id, summary_length="medium", summary_style="simple"):
+    """Book summary = reduce step over the stored chapter summaries."""
+    book = get_book_by_id(book_id)
+    if not book:
+        raise ValueError(f"Book not found: {book_id}")
+
+    done = {
+        s["chapter_index"]: s
+        for s in get_chapter_summaries(book_id, summary_length, summary_style)
+    }
+    chapters = book.get("chapters") or []
+    missing = [c["title"] for c in chapters if c["index"] not in done]
+    if missing:
+        raise ValueError(f"Chapters not summarized yet: {', '.join(missing)}")
+    ordered = [done[c["index"]] for c in chapters]
+
+    start = time.time()
+    final, entries = reduce_summaries([s["summary_text"] for s in ordered], summary_length)
+    chunk_summaries = [
+        {"level": 0, "chunk": i, "text": s["summary_text"], "chapter": s["chapter_title"]}
+        for i, s in enumerate(ordered, start=1)
+    ]
     summary_id = create_summary(
         book_id=book_id,
         user_id=user_id,
-        summary_text=summary_text,
-        summary_length="short",
-        summary_style="paragraphs",
-        chunk_summaries=[{"chunk": 1, "text": "dummy chunk"}],
-        processing_time=0.1
+        summary_text=" ".join(final),
+        summary_length=summary_length,
+        summary_style=summary_style,
+        chunk_summaries=chunk_summaries + entries,
+        processing_time=round(
+            sum(s["processing_time"] for s in ordered) + time.time() - start, 2
+        )
     )
 
-    # 5. Update status → completed
     update_book_status(book_id, "completed")
-
     print("Summary created:", summary_id)
     return summary_id
@@ -10,36 +10,26 @@ from utils.database import (
     create_summary,
     get_user_by_email,
 )
+from utils.chunking import chunk_by_tokens
+from utils.full_summary import summarize_chunks
+from utils.summary_cache import cache_stats
+from scripts.process_book import enqueue_book
 from datetime import datetime
 import time
 
-# -----------------------------
-# Fake AI Summary generator
-# -----------------------------
-def generate_ai_summary(text, length="short", style="paragraphs"):
-    if not text:
-        return "No text found."
-
-    base_summary = f"This is a {length} summary generated in {style} format."
-    return base_summary
-
-
 # -----------------------------
 # Chunk text into small parts
 # -----------------------------
-def chunk_text(raw_text, chunk_size=300):
-    words = raw_text.split()
-    chunks = []
-    for i in range(0, len(words), chunk_size):
-        chunk_str = " ".join(words[i:i + chunk_size])
-        chunks.append(chunk_str)
-    return chunks
+def chunk_text(raw_text, chunk_size=None):
+    # dicts carry their input_ids, so the summarizer doesn't tokenize again
+    return chunk_by_tokens(raw_text, max_tokens=chunk_size)
 
 
 # -----------------------------
 # MAIN PIPELINE
 # -----------------------------
-def run_pipeline(user_email, title, raw_text):
+def run_pipeline(user_email, title, raw_text, background=False,
+                 summary_length="short", summary_style="paragraphs"):
     print("\n--- Starting Summarization Pipeline ---\n")
 
     # 1. find user
@@ -51,9 +41,16 @@ def run_pipeline(user_email, title, raw_text):
 
     # 2. create book entry
     print("📌 Creating book record...")
-    book_id = create_book(user_id=user_id, title=title, raw_text=raw_text)
+    book_id = create_book(user_id=user_id, title=title, author=None, text=raw_text)
     print("✔ Book created:", book_id)
 
+    # hand off to scripts/worker.py instead of summarizing inline
+    if background:
+        job_id = enqueue_book(book_id, user_id, summary_length=summary_length,
+                              summary_style=summary_style)
+        print("📥 Queued job:", job_id)
+        return job_id
+
     update_book_status(book_id, "processing")
 
     # 3. chunk text
@@ -65,9 +62,9 @@ def run_pipeline(user_email, title, raw_text):
     chunk_summaries = []
     start_time = time.time()
 
-    for i, ch in enumerate(chunks, start=1):
-        s = generate_ai_summary(ch, length="short", style="paragraphs")
-        chunk_summaries.append({"chunk": i, "text": s})
+    # cached chunks are reused, only new chunks go through the model
+    for i, s in enumerate(summarize_chunks(chunks, summary_length=summary_length), start=1):
+        chunk_summaries.append({"level": 0, "chunk": i, "text": s})
 
     # 5. combine final summary
     full_summary = " ".join([c["text"] for c in chunk_summaries])
@@ -81,8 +78,8 @@ def run_pipeline(user_email, title, raw_text):
         book_id=book_id,
         user_id=user_id,
         summary_text=full_summary,
-        summary_length="short",
-        summary_style="paragraphs",
+        summary_length=summary_length,
+        summary_style=summary_style,
         chunk_summaries=chunk_summaries,
         processing_time=total_time
     )
@@ -93,6 +90,7 @@ def run_pipeline(user_email, title, raw_text):
     print("📚 Book ID:", book_id)
     print("📝 Summary ID:", summary_id)
     print("⏱ Total processing time:", total_time, "seconds")
+    print("🗃 Chunk cache:", cache_stats())
 
     return summary_id
 
@@ -0,0 +1,111 @@
+# scripts/worker.py
+"""Background workers for the MongoDB job queue.
+
+Run as many hosts as needed; every worker claims jobs from the same queue.
+
+    python scripts/worker.py --processes 4
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import threading
+
+# Add project root folder to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config.settings import JOB_HEARTBEAT_SECONDS, JOB_POLL_SECONDS
+from utils.job_queue import claim_job, complete_job, fail_job, heartbeat
+from scripts.process_book import (
+    process_book, process_chapter, combine_chapters,
+    JOB_TYPE, CHAPTER_JOB_TYPE, COMBINE_JOB_TYPE
+)
+
+logger = logging.getLogger("worker")
+
+# job type -> handler(**payload)
+HANDLERS = {
+    JOB_TYPE: process_book,
+    CHAPTER_JOB_TYPE: process_chapter,
+    COMBINE_JOB_TYPE: combine_chapters,
+}
+
+
+class _Heartbeat(threading.Thread):
+    def __init__(self, job_id, worker_id):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.worker_id = worker_id
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(JOB_HEARTBEAT_SECONDS):
+            if not heartbeat(self.job_id, self.worker_id):
+                logger.warning("Lost lease on job %s", self.job_id)
+                return
+
+
+def run_worker(job_types=None):
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    signal.signal(signal.SIGINT, lambda *_: stopping.set())
+    logger.info("Worker %s started", worker_id)
+
+    while not stopping.is_set():
+        job = claim_job(worker_id, job_types=job_types or list(HANDLERS))
+        if job is None:
+            stopping.wait(JOB_POLL_SECONDS)
+            continue
+
+        logger.info("Worker %s running job %s (%s)", worker_id, job["_id"], job["type"])
+        beat = _Heartbeat(job["_id"], worker_id)
+        beat.start()
+        try:
+            result = HANDLERS[job["type"]](**job["payload"])
+        except Exception as e:
+            logger.exception("Job %s failed", job["_id"])
+            fail_job(job, worker_id, e)
+        else:
+            complete_job(job["_id"], worker_id, result=str(result))
+        finally:
+            beat.stopped.set()
+
+    logger.info("Worker %s stopped", worker_id)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--job-types", nargs="*")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO,
+                        format="%(asctime)s - %(levelname)s - %(message)s")
+
+    if args.processes <= 1:
+        run_worker(args.job_types)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=run_worker, args=(args.job_types,))
+             for _ in range(args.processes)]
+    for p in procs:
+        p.start()
+
+    # forward shutdown to the children and wait for their current job
+    def _stop(*_):
+        for p in procs:
+            if p.is_alive():
+                p.terminate()
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    for p in procs:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
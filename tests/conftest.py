@@ -0,0 +1,64 @@
+# tests/conftest.py
+import os
+import re
+import sys
+
+import pytest
+
+# Add project root folder to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class WordTokenizer:
+    """Stand-in for the BART tokenizer: one token per word, two specials."""
+
+    model_max_length = 1024
+
+    def __init__(self):
+        self.vocab = {}
+
+    def _ids(self, text):
+        return [self.vocab.setdefault(w, len(self.vocab) + 3) for w in text.split()]
+
+    def __call__(self, texts, add_special_tokens=True, return_offsets_mapping=False):
+        encoded = {"input_ids": [self._ids(t) for t in texts]}
+        if return_offsets_mapping:
+            encoded["offset_mapping"] = [[m.span() for m in re.finditer(r"\S+", t)]
+                                         for t in texts]
+        return encoded
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def build_inputs_with_special_tokens(self, ids):
+        return [0] + list(ids) + [2]
+
+    def decode(self, ids):
+        words = {i: w for w, i in self.vocab.items()}
+        return " ".join(words[i] for i in ids)
+
+
+def split_sentences(text):
+    return [s for s in re.split(r"(?<=\.)\s+", text.strip()) if s]
+
+
+@pytest.fixture
+def fake_model(monkeypatch):
+    """Word tokenizer, regex sentences and a model that records its inputs,
+    for utils.full_summary; returns the list of summarized chunk texts."""
+    from utils import chunking, full_summary
+    from utils.cache import LRUCache
+
+    tokenizer = WordTokenizer()
+    calls = []
+
+    def generate_summaries(chunks, batch_size=None, **generate_kwargs):
+        texts = [c["text"] if isinstance(c, dict) else c for c in chunks]
+        calls.extend(texts)
+        return [f"Summary {len(calls) - len(texts) + i}." for i in range(len(texts))]
+
+    monkeypatch.setattr(chunking, "get_tokenizer", lambda *a, **k: tokenizer)
+    monkeypatch.setattr(chunking, "segment_sentences", split_sentences)
+    monkeypatch.setattr(full_summary, "generate_summaries", generate_summaries)
+    monkeypatch.setattr(full_summary, "summary_cache", LRUCache(100000))
+    return calls
@@ -0,0 +1,41 @@
+# tests/test_chapter_runs.py
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from utils import database  # noqa: E402
+from utils.database import finish_chapter, start_chapter_run  # noqa: E402
+
+
+@pytest.fixture
+def book_id(monkeypatch):
+    books = mongomock.MongoClient().db.books
+    monkeypatch.setattr(database, "books", books)
+    return books.insert_one({"title": "Book"}).inserted_id
+
+
+def test_last_chapter_finishes_the_run_once(book_id):
+    start_chapter_run(book_id, [0, 1, 2], "medium", "simple")
+    assert not finish_chapter(book_id, 0, "medium", "simple")
+    assert not finish_chapter(book_id, 2, "medium", "simple")
+    assert finish_chapter(book_id, 1, "medium", "simple")
+    # a retried job for a finished chapter doesn't finish it again
+    assert not finish_chapter(book_id, 1, "medium", "simple")
+
+
+def test_rerun_joins_a_run_in_progress(book_id):
+    start_chapter_run(book_id, [0, 1], "medium", "simple")
+    assert not finish_chapter(book_id, 0, "medium", "simple")
+    start_chapter_run(book_id, [0], "medium", "simple")
+    assert not finish_chapter(book_id, 1, "medium", "simple")
+    assert finish_chapter(book_id, 0, "medium", "simple")
+
+
+def test_runs_for_other_variants_do_not_overwrite_each_other(book_id):
+    start_chapter_run(book_id, [0, 1], "medium", "simple")
+    start_chapter_run(book_id, [0, 1], "short", "bullets")
+
+    assert not finish_chapter(book_id, 0, "medium", "simple")
+    assert not finish_chapter(book_id, 0, "short", "bullets")
+    assert finish_chapter(book_id, 1, "medium", "simple")
+    assert finish_chapter(book_id, 1, "short", "bullets")
@@ -0,0 +1,138 @@
+# tests/test_chunking.py
+import random
+import re
+
+import pytest
+
+from utils.chunking import chunk_by_tokens, content_defined_spans, pack_spans, token_spans
+
+
+def _windows_are_valid(lengths, windows, budget, overlap):
+    assert windows[0][0] == 0
+    assert windows[-1][1] == len(lengths)
+    for (first, last), (next_first, next_last) in zip(windows, windows[1:]):
+        # consecutive, carried tail within the overlap, always moving forward
+        assert first < next_first <= last < next_last
+        assert sum(lengths[next_first:last]) <= overlap
+    for first, last in windows:
+        assert last - first == 1 or sum(lengths[first:last]) <= budget
+
+
+@pytest.mark.parametrize("overlap", [0, 10, 40])
+def test_pack_spans_respects_budget_and_overlap(overlap):
+    rng = random.Random(overlap)
+    lengths = [rng.randint(1, 30) for _ in range(500)]
+    windows = pack_spans(lengths, 100, overlap)
+    _windows_are_valid(lengths, windows, 100, overlap)
+
+
+def test_pack_spans_fills_windows():
+    assert pack_spans([3, 3, 3, 3, 3], 9) == [(0, 3), (3, 5)]
+    assert pack_spans([3, 3, 3, 3, 3], 9, overlap=3) == [(0, 3), (2, 5)]
+
+
+def test_pack_spans_oversized_item_gets_its_own_window():
+    assert pack_spans([2, 50, 2], 10) == [(0, 1), (1, 2), (2, 3)]
+
+
+def test_pack_spans_empty():
+    assert pack_spans([], 10) == []
+
+
+def _pieces(sentences):
+    # (sentence, token ids) with one token per word
+    return [(s, list(range(len(s.split())))) for s in sentences]
+
+
+def _text(n, seed=0):
+    rng = random.Random(seed)
+    words = "the storm broke over the harbour while ships pulled at their moorings".split()
+    return [" ".join(rng.choice(words) for _ in range(rng.randint(5, 25))) + f" {i}."
+            for i in range(n)]
+
+
+def test_content_defined_spans_cover_text_within_budget():
+    pieces = _pieces(_text(2000))
+    windows = content_defined_spans(pieces, 200)
+
+    assert windows[0][0] == 0 and windows[-1][1] == len(pieces)
+    assert all(a[1] == b[0] for a, b in zip(windows, windows[1:]))
+    sizes = [sum(len(ids) for _, ids in pieces[s:e]) for s, e in windows]
+    assert max(sizes) <= 200
+    # most of each model window is used
+    assert sum(sizes) / (len(sizes) * 200) > 0.75
+
+
+def test_content_defined_spans_resynchronize_after_an_edit():
+    sentences = _text(2000)
+    edited = sentences[:1000] + ["An entirely new sentence."] + sentences[1000:]
+
+    def chunks(sents):
+        pieces = _pieces(sents)
+        return [tuple(s for s, _ in pieces[a:b])
+                for a, b in content_defined_spans(pieces, 200)]
+
+    before = chunks(sentences)
+    after = chunks(edited)
+    changed = set(after) - set(before)
+    assert 1 <= len(changed) <= 3
+
+
+class ByteLevelTokenizer:
+    """BART-like: the space before a word belongs to the word's token."""
+
+    model_max_length = 1024
+
+    def __init__(self):
+        self.tokens = []
+
+    def _id(self, token):
+        if token not in self.tokens:
+            self.tokens.append(token)
+        return self.tokens.index(token) + 3
+
+    def __call__(self, texts, add_special_tokens=True, return_offsets_mapping=False):
+        matches = [list(re.finditer(r" ?\S+", t)) for t in texts]
+        encoded = {"input_ids": [[self._id(m.group()) for m in ms] for ms in matches]}
+        if return_offsets_mapping:
+            # trimmed like the fast tokenizer's: the space is not part of the word
+            encoded["offset_mapping"] = [[(m.start() + m.group().startswith(" "), m.end())
+                                          for m in ms] for ms in matches]
+        return encoded
+
+    def num_special_tokens_to_add(self):
+        return 2
+
+    def build_inputs_with_special_tokens(self, ids):
+        return [0] + list(ids) + [2]
+
+    def decode(self, ids):
+        return "".join(self.tokens[i - 3] for i in ids)
+
+
+def test_chunk_ids_match_the_chunk_text():
+    tokenizer = ByteLevelTokenizer()
+    sentences = _text(200)
+    chunks = chunk_by_tokens(None, max_tokens=100, tokenizer=tokenizer, sentences=sentences)
+
+    assert len(chunks) > 5
+    for chunk in chunks:
+        # "harbour. Ships", never "harbour.Ships"
+        assert tokenizer.decode(chunk["input_ids"][1:-1]).strip() == chunk["text"]
+        assert chunk["token_count"] <= 98
+
+
+def test_token_spans_split_long_sentences_on_token_offsets():
+    tokenizer = ByteLevelTokenizer()
+    text = "Short one. " + " ".join(f"w{i}" for i in range(25)) + ". Tail."
+    spans = [(0, 10), (11, text.index(". Tail") + 1), (len(text) - 5, len(text))]
+
+    pieces = token_spans(text, spans, tokenizer, 10)
+    assert [text[s:e] for s, e, _ in pieces] == [
+        "Short one.",
+        "w0 w1 w2 w3 w4 w5 w6 w7 w8 w9",
+        "w10 w11 w12 w13 w14 w15 w16 w17 w18 w19",
+        "w20 w21 w22 w23 w24.",
+        "Tail.",
+    ]
+    assert [n for _, _, n in pieces] == [2, 10, 10, 5, 1]
@@ -0,0 +1,67 @@
+# tests/test_docx_stream.py
+import io
+import zipfile
+
+from backend.docx_stream import extract_text_from_docx_stream, iter_docx_blocks
+
+_NS = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+
+def _p(*runs):
+    return "<w:p>" + "".join(f"<w:r><w:t>{r}</w:t></w:r>" for r in runs) + "</w:p>"
+
+
+def _table(*rows):
+    return "<w:tbl>" + "".join(
+        "<w:tr>" + "".join(f"<w:tc>{cell}</w:tc>" for cell in row) + "</w:tr>"
+        for row in rows
+    ) + "</w:tbl>"
+
+
+def _docx(body):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("word/document.xml",
+                         f"<w:document {_NS}><w:body>{body}</w:body></w:document>")
+    return buffer.getvalue()
+
+
+def test_paragraphs_and_rows_in_document_order():
+    body = (_p("Chapter ", "One") + _p("") +
+            _table([_p("a"), _p("b")], [_p("c"), _p("d") + _p("e")]) +
+            _p("The end"))
+    assert list(iter_docx_blocks(_docx(body))) == [
+        ("paragraph", "Chapter One"),
+        ("row", "a | b"),
+        ("row", "c | d\ne"),
+        ("paragraph", "The end"),
+    ]
+
+
+def test_nested_table_folds_into_its_cell():
+    inner = _table([_p("x"), _p("y")])
+    body = _table([_p("outer") + inner, _p("z")])
+    assert list(iter_docx_blocks(_docx(body))) == [("row", "outer\nx | y | z")]
+
+
+def test_tabs_and_breaks():
+    body = '<w:p><w:r><w:t>a</w:t><w:tab/><w:t>b</w:t><w:br/><w:t>c</w:t></w:r></w:p>'
+    assert list(iter_docx_blocks(io.BytesIO(_docx(body)))) == [("paragraph", "a\tb\nc")]
+
+
+def test_max_chars_stops_early():
+    data = _docx(_p("0123456789") + _p("abcdefghij") + _p("never read"))
+    assert list(iter_docx_blocks(data, max_chars=15)) == [
+        ("paragraph", "0123456789"),
+        ("paragraph", "abcde"),
+    ]
+
+    report = {}
+    assert extract_text_from_docx_stream(data, report, max_chars=15) == "0123456789\nabcde"
+    assert report["truncated"]
+
+
+def test_malformed_docx_returns_an_error():
+    assert extract_text_from_docx_stream(b"not a zip").startswith("ERROR:")
+    broken = _docx("<w:p><w:r><w:t>unclosed")
+    assert extract_text_from_docx_stream(broken).startswith("ERROR:")
@@ -0,0 +1,144 @@
+# tests/test_full_summary.py
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from utils import full_summary
+from utils.chunking import chunk_by_tokens
+from utils.full_summary import (
+    SUMMARY_TARGET_WORDS,
+    book_chunks,
+    map_reduce_summarize,
+    reduce_summaries,
+    reusable_chunks,
+    summary_variants
+)
+
+
+def _book(n=3000, seed=0):
+    rng = random.Random(seed)
+    words = "the storm broke over the harbour while ships pulled at their moorings".split()
+    return " ".join(" ".join(rng.choice(words) for _ in range(rng.randint(5, 25))) + f" {i}."
+                    for i in range(n))
+
+
+def test_revision_reuses_first_version_chunks(fake_model):
+    v1 = _book()
+    middle = v1.index(" 1500.") + len(" 1500.")
+    v2 = v1[:middle] + " A paragraph added in the second draft." + v1[middle:]
+
+    first = map_reduce_summarize(v1, workers=1, extractive_ratio=0)
+    chunks = len(book_chunks(v2, extractive_ratio=0))
+    assert chunks > 20
+
+    fake_model.clear()
+    second = map_reduce_summarize(v2, workers=1, extractive_ratio=0,
+                                  reuse=reusable_chunks({"chunk_summaries": first["chunk_summaries"]}))
+    assert second["reused"] >= chunks - 3
+    level0 = [e for e in second["chunk_summaries"] if e["level"] == 0]
+    assert len(level0) == chunks
+    assert "A paragraph added in the second draft." in " ".join(fake_model)
+
+
+def _summaries(n, words=50):
+    return [" ".join(["word"] * (words - 1)) + f" {i}." for i in range(n)]
+
+
+def test_reduce_collapses_level_by_level(fake_model):
+    final, entries = reduce_summaries(_summaries(200), "medium", workers=1)
+
+    levels = sorted({e["level"] for e in entries})
+    assert levels == [1]
+    assert len(final) == len([e for e in entries if e["level"] == 1]) > 1
+    assert sum(len(t.split()) for t in final) <= SUMMARY_TARGET_WORDS["medium"]
+
+
+def test_reduce_leaves_short_input_alone(fake_model):
+    final, entries = reduce_summaries(_summaries(2, words=20), "medium", workers=1)
+    assert len(final) == 2 and entries == [] and fake_model == []
+
+
+def test_reduce_skips_fitted_single_group(fake_model):
+    summaries = _summaries(5)
+    final, entries = reduce_summaries(summaries, "short", workers=1, fitted=True)
+    assert final == summaries and entries == [] and fake_model == []
+
+
+def test_reduce_runs_one_final_pass_for_a_single_group(fake_model):
+    final, entries = reduce_summaries(_summaries(5), "short", workers=1)
+    assert len(fake_model) == 1
+    assert final == ["Summary 0."]
+    assert entries == [{"level": 1, "chunk": 1, "text": "Summary 0."}]
+
+
+def test_reduce_stops_when_a_pass_does_not_shrink(fake_model, monkeypatch):
+    def echo(chunks, batch_size=None, **generate_kwargs):
+        fake_model.extend(c["text"] for c in chunks)
+        return [c["text"] for c in chunks]
+
+    monkeypatch.setattr(full_summary, "generate_summaries", echo)
+    summaries = _summaries(200)
+    final, entries = reduce_summaries(summaries, "medium", workers=1)
+
+    # one wasted pass, not MAX_REDUCE_LEVELS of them
+    assert len(fake_model) == len(chunk_by_tokens(" ".join(summaries)))
+    assert final == summaries and entries == []
+
+
+@pytest.fixture
+def stored(monkeypatch):
+    """In-memory stand-in for the summaries collection."""
+    docs = {}
+
+    def get_summary(book_id, summary_length=None, summary_style=None):
+        return docs.get((summary_length, summary_style))
+
+    def create_summary(book_id, user_id, summary_text, summary_length, summary_style,
+                       chunk_summaries, processing_time):
+        docs[(summary_length, summary_style)] = {
+            "summary_text": summary_text, "chunk_summaries": chunk_summaries,
+            "created_at": datetime.utcnow()
+        }
+        return f"{summary_length}/{summary_style}"
+
+    monkeypatch.setattr(full_summary, "get_summary", get_summary)
+    monkeypatch.setattr(full_summary, "create_summary", create_summary)
+    return docs
+
+
+def _source(n=40):
+    chunk_summaries = [{"level": 0, "chunk": i, "text": t, "hash": f"h{i}"}
+                       for i, t in enumerate(_summaries(n), start=1)]
+    chunk_summaries.append({"level": 1, "chunk": 1, "text": "old reduce"})
+    return {"chunk_summaries": chunk_summaries, "created_at": datetime.utcnow()}
+
+
+def test_variants_rerun_only_the_reduce_step(fake_model, stored):
+    source = _source()
+    created = summary_variants("b1", "u1", source, lengths=("short", "long"),
+                               styles=("simple", "bullets"), workers=1)
+
+    assert set(created) == {("short", "simple"), ("short", "bullets"),
+                            ("long", "simple"), ("long", "bullets")}
+    # no chunk is mapped again; the intermediate level is shared by both
+    # lengths through the summary cache and styles cost no model calls
+    assert len(fake_model) == len(chunk_by_tokens(" ".join(_summaries(40))))
+    bullets = stored[("short", "bullets")]
+    assert bullets["summary_text"].startswith("- ")
+    level0 = [e for e in bullets["chunk_summaries"] if e["level"] == 0]
+    assert level0 == [e for e in source["chunk_summaries"] if e["level"] == 0]
+    assert stored[("short", "simple")]["chunk_summaries"] == bullets["chunk_summaries"]
+
+
+def test_variants_skip_newer_ones(fake_model, stored):
+    source = _source()
+    stored[("short", "simple")] = {"created_at": source["created_at"] + timedelta(seconds=1)}
+    assert set(summary_variants("b1", "u1", source, workers=1)) == {
+        ("medium", "simple"), ("long", "simple")
+    }
+
+
+def test_variants_need_chunk_summaries(stored):
+    with pytest.raises(ValueError):
+        summary_variants("b1", "u1", {"chunk_summaries": [], "created_at": datetime.utcnow()})
@@ -0,0 +1,54 @@
+# tests/test_inference_pool.py
+import os
+
+import pytest
+
+from utils.inference_pool import InferencePool
+
+
+class CountingTokenizer:
+    def pad(self, batch, return_tensors=None):
+        return batch
+
+    def batch_decode(self, output, skip_special_tokens=True):
+        return [f"summary of {n} tokens" for n in output]
+
+
+class CountingModel:
+    """Loaded inside each worker (no ``share_memory``, like an ONNX session)."""
+
+    def generate(self, input_ids, crash=False, **generate_kwargs):
+        if crash:
+            os._exit(3)
+        return [len(ids) for ids in input_ids]
+
+
+def load_counting_model():
+    return CountingModel()
+
+
+@pytest.fixture
+def pool():
+    p = InferencePool(load_counting_model, CountingTokenizer(), workers=2, threads=1)
+    p.start()
+    yield p
+    p.shutdown()
+
+
+def test_spawned_workers_serve_batches(pool):
+    futures = [pool.submit([[1] * n, [2] * (n + 1)]) for n in range(1, 7)]
+    assert [f.result(timeout=60) for f in futures] == [
+        [f"summary of {n} tokens", f"summary of {n + 1} tokens"] for n in range(1, 7)
+    ]
+    stats = pool.stats()
+    assert sum(w["batches"] for w in stats["per_worker"]) == 6
+    assert stats["broken"] is None
+
+
+def test_dead_worker_fails_pending_batches(pool):
+    future = pool.submit([[1]], {"crash": True})
+    with pytest.raises(RuntimeError, match="exited with code 3"):
+        future.result(timeout=60)
+    assert pool.broken
+    with pytest.raises(RuntimeError, match="broken"):
+        pool.submit([[1]])
@@ -0,0 +1,123 @@
+# tests/test_inference_server.py
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.inference_server import DynamicBatcher, InferenceClient, StubModel, make_server
+
+
+@pytest.fixture
+def batcher():
+    made = []
+
+    def make(model=None, max_batch_size=4, max_wait_ms=50):
+        b = DynamicBatcher(model or StubModel(), max_batch_size, max_wait_ms)
+        made.append(b)
+        return b
+
+    yield make
+    for b in made:
+        b.stop()
+
+
+def test_concurrent_requests_share_batches(batcher):
+    model = StubModel()
+    b = batcher(model, max_batch_size=4, max_wait_ms=500)
+    futures = [b.submit([1] * n) for n in range(1, 9)]
+    results = [f.result(timeout=5) for f in futures]
+
+    assert results == [f"summary of {n} tokens" for n in range(1, 9)]
+    assert model.batches == [4, 4]
+    metrics = b.metrics()
+    assert metrics["batches"] == 2
+    assert metrics["items"] == 8
+    assert metrics["batch_size_histogram"] == {4: 2}
+    assert metrics["queue_depth"] == 0
+
+
+def test_partial_batch_flushes_after_max_wait(batcher):
+    model = StubModel()
+    b = batcher(model, max_batch_size=16, max_wait_ms=20)
+    assert b.submit([1, 2, 3]).result(timeout=5) == "summary of 3 tokens"
+    assert model.batches == [1]
+
+
+def test_params_are_never_mixed_in_a_batch(batcher):
+    seen = []
+
+    def model(batch, params):
+        seen.append((len(batch), params))
+        return ["x"] * len(batch)
+
+    b = batcher(model, max_batch_size=8, max_wait_ms=50)
+    futures = [b.submit([1], {"num_beams": 1 + i % 2}) for i in range(6)]
+    for f in futures:
+        f.result(timeout=5)
+    assert sorted(seen, key=lambda s: s[1]["num_beams"]) == [
+        (3, {"num_beams": 1}), (3, {"num_beams": 2})
+    ]
+
+
+def test_model_error_fails_the_batch(batcher):
+    def model(batch, params):
+        raise RuntimeError("out of memory")
+
+    b = batcher(model, max_wait_ms=1)
+    with pytest.raises(RuntimeError, match="out of memory"):
+        b.submit([1]).result(timeout=5)
+    assert b.metrics()["errors"] == 1
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_http_clients_are_batched_together(batcher):
+    model = StubModel(delay=0.05)
+    b = batcher(model, max_batch_size=8, max_wait_ms=200)
+    server = make_server(b, port=0)
+    _serve(server)
+    try:
+        client = InferenceClient(f"http://127.0.0.1:{server.server_address[1]}")
+        with ThreadPoolExecutor(4) as pool:
+            results = list(pool.map(lambda n: client.summarize([[1] * n, [2] * n]),
+                                    range(1, 5)))
+        assert results == [[f"summary of {n} tokens"] * 2 for n in range(1, 5)]
+        # four sessions, two chunks each, in fewer than four model calls
+        assert sum(model.batches) == 8
+        assert len(model.batches) < 4
+        assert client.metrics()["items"] == 8
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_unix_socket_transport(batcher):
+    b = batcher(max_wait_ms=1)
+    path = os.path.join(tempfile.mkdtemp(), "summarizer.sock")
+    server = make_server(b, unix_socket=path)
+    _serve(server)
+    try:
+        client = InferenceClient(f"unix://{path}")
+        assert client.summarize([[1, 2]]) == ["summary of 2 tokens"]
+        assert client.metrics()["batches"] == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_bad_request_is_a_client_error(batcher):
+    server = make_server(batcher(), port=0)
+    _serve(server)
+    try:
+        client = InferenceClient(f"http://127.0.0.1:{server.server_address[1]}")
+        with pytest.raises(RuntimeError, match="400"):
+            client._request("POST", "/summarize", {"params": {}})
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,121 @@
+# tests/test_job_queue.py
+from datetime import datetime, timedelta
+
+import pytest
+
+mongomock = pytest.importorskip("mongomock")
+
+from utils import job_queue  # noqa: E402
+from utils.job_queue import (  # noqa: E402
+    backoff_seconds, claim_job, complete_job, enqueue_job, fail_job, get_job, heartbeat
+)
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    db = mongomock.MongoClient().db
+    statuses = {}
+    monkeypatch.setattr(job_queue, "jobs", db.jobs)
+    monkeypatch.setattr(job_queue, "dead_jobs", db.dead_jobs)
+    monkeypatch.setattr(job_queue, "update_book_status",
+                        lambda book_id, status: statuses.__setitem__(book_id, status))
+    return db, statuses
+
+
+def _make_runnable(db, job_id):
+    db.jobs.update_one({"_id": job_id},
+                       {"$set": {"available_at": datetime.utcnow() - timedelta(seconds=1)}})
+
+
+def _expire_lease(db, job_id):
+    db.jobs.update_one({"_id": job_id},
+                       {"$set": {"lease_expires": datetime.utcnow() - timedelta(seconds=1)}})
+
+
+def test_claim_is_exclusive_and_complete_finishes(queue):
+    db, _ = queue
+    job_id = enqueue_job("summarize_book", {"book_id": "b1"})
+
+    job = claim_job("w1")
+    assert job["_id"] == job_id and job["attempts"] == 1
+    assert claim_job("w2") is None
+    assert heartbeat(job_id, "w1")
+
+    complete_job(job_id, "w1", result="s1")
+    assert get_job(job_id)["status"] == "done"
+    assert claim_job("w2") is None
+
+
+def test_expired_lease_is_reclaimed(queue):
+    db, _ = queue
+    job_id = enqueue_job("summarize_book", {"book_id": "b1"})
+    claim_job("w1")
+    _expire_lease(db, job_id)
+
+    job = claim_job("w2")
+    assert job["worker_id"] == "w2" and job["attempts"] == 2
+    # the crashed worker no longer owns it
+    assert not heartbeat(job_id, "w1")
+    complete_job(job_id, "w1")
+    assert get_job(job_id)["status"] == "running"
+
+
+def test_failure_retries_with_backoff(queue):
+    db, statuses = queue
+    job_id = enqueue_job("summarize_book", {"book_id": "b1"}, max_attempts=3)
+
+    assert not fail_job(claim_job("w1"), "w1", ValueError("boom"))
+    job = get_job(job_id)
+    assert job["status"] == "queued" and job["last_error"] == "boom"
+    assert job["available_at"] > datetime.utcnow() + timedelta(seconds=backoff_seconds(1) - 5)
+    assert claim_job("w1") is None
+
+    _make_runnable(db, job_id)
+    assert claim_job("w1")["attempts"] == 2
+    assert statuses == {}
+
+
+def test_last_failure_dead_letters_and_fails_the_book(queue):
+    db, statuses = queue
+    job_id = enqueue_job("summarize_book", {"book_id": "b1"}, max_attempts=2)
+
+    fail_job(claim_job("w1"), "w1", "first")
+    _make_runnable(db, job_id)
+    assert fail_job(claim_job("w1"), "w1", "second")
+
+    assert db.jobs.count_documents({}) == 0
+    dead = get_job(job_id)
+    assert dead["status"] == "dead" and dead["last_error"] == "second"
+    assert statuses == {"b1": "failed"}
+
+
+def test_job_that_keeps_crashing_is_dead_lettered_on_reclaim(queue):
+    db, statuses = queue
+    job_id = enqueue_job("summarize_book", {"book_id": "b1"}, max_attempts=2)
+    for worker in ("w1", "w2"):
+        claim_job(worker)
+        _expire_lease(db, job_id)
+
+    assert claim_job("w3") is None
+    assert get_job(job_id)["status"] == "dead"
+    assert statuses == {"b1": "failed"}
+
+
+def test_stale_worker_cannot_dead_letter_a_reclaimed_job(queue):
+    db, statuses = queue
+    job_id = enqueue_job("summarize_book", {"book_id": "b1"}, max_attempts=1)
+    stale = claim_job("w1")
+    _expire_lease(db, job_id)
+    db.jobs.update_one({"_id": job_id}, {"$set": {"max_attempts": 2}})
+    claim_job("w2")
+
+    assert not fail_job(stale, "w1", "late failure")
+    assert get_job(job_id)["worker_id"] == "w2"
+    assert statuses == {}
+
+
+def test_backoff_is_exponential_and_capped():
+    assert [backoff_seconds(n) for n in (1, 2, 3)] == [
+        job_queue.JOB_BACKOFF_BASE * f for f in (1, 2, 4)
+    ]
+    assert backoff_seconds(50) == job_queue.JOB_BACKOFF_MAX
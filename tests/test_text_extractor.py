@@ -0,0 +1,95 @@
+# tests/test_text_extractor.py
+import io
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from backend import text_extractor  # noqa: E402
+from backend.extractor_registry import get_extractor  # noqa: E402
+from backend.text_extractor import (  # noqa: E402
+    extract_text_from_pdf, extract_text_from_pdf_pymupdf, iter_extracted_text
+)
+
+
+def _pdf(pages=40):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i + 1} of the test book.")
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+@pytest.fixture(scope="module")
+def pdf(tmp_path_factory):
+    data = _pdf()
+    path = tmp_path_factory.mktemp("pdf") / "book.pdf"
+    path.write_bytes(data)
+    return data, str(path)
+
+
+@pytest.fixture
+def windows(monkeypatch):
+    """Force the parallel page-window path; records what gets spooled."""
+    spooled = []
+    spool = text_extractor.spooled_path
+
+    def tracking(source, suffix=""):
+        spooled.append(source)
+        return spool(source, suffix)
+
+    monkeypatch.setattr(text_extractor, "parallel_pdf", lambda page_count, *args: page_count > 8)
+    monkeypatch.setattr(text_extractor, "spooled_path", tracking)
+    return spooled
+
+
+def _expected(n=40):
+    return [f"Page {i + 1} of the test book." for i in range(n)]
+
+
+def _lines(text):
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+@pytest.mark.parametrize("extract", [extract_text_from_pdf, extract_text_from_pdf_pymupdf])
+def test_uploads_go_through_page_windows(pdf, windows, extract):
+    data, path = pdf
+    for source in (data, io.BytesIO(data), path):
+        report = {}
+        assert _lines(extract(source, report)) == _expected()
+        assert report == {"page_count": 40, "empty_pages": []}
+    # bytes and the file object were spooled, the path was used as is
+    assert len(windows) == 3 and windows[-1] == path
+
+
+def test_stream_ingestion_goes_through_page_windows(pdf, windows):
+    data, _ = pdf
+    report = {}
+    stream = io.BytesIO(data)
+    pieces = list(iter_extracted_text(stream, "pdf", len(data), report))
+    assert _lines("".join(pieces)) == _expected()
+    assert report["page_count"] == 40
+    assert windows == [stream]
+
+
+def test_small_pdf_stays_in_process(windows):
+    data = _pdf(pages=3)
+    assert _lines(extract_text_from_pdf(data)) == _expected(3)
+    assert windows == []
+
+
+@pytest.mark.parametrize("name", ["pypdf2", "pymupdf", "pdfplumber"])
+@pytest.mark.parametrize("parallel", [False, True])
+def test_page_range_backends_honour_start_and_end(pdf, monkeypatch, name, parallel):
+    backend = get_extractor("pdf", name=name, page_ranges=True)
+    if backend is None:
+        pytest.skip(f"{name} is not installed")
+    monkeypatch.setattr(text_extractor, "parallel_pdf", lambda page_count, *args: parallel)
+
+    data, path = pdf
+    for source in (data, path):
+        report = {}
+        assert _lines(backend(source, report=report, start=5, end=30)) == _expected()[5:30]
+        assert report["page_count"] == 40
+    assert _lines(backend(data, start=35, end=99)) == _expected()[35:]
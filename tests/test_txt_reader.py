@@ -0,0 +1,36 @@
+# tests/test_txt_reader.py
+import codecs
+import io
+
+from backend.txt_reader import (
+    detect_encoding, detect_stream_encoding, iter_decoded, read_text_file
+)
+
+_ASCII_HEAD = b"It was a dark and stormy night; the rain fell in torrents.\n" * 2300
+_CP1252_TAIL = "Café naïve résumé “quoted” — déjà vu.\n".encode("cp1252") * 20
+
+
+def test_ascii_head_does_not_hide_a_cp1252_tail():
+    data = _ASCII_HEAD + _CP1252_TAIL
+    assert len(_ASCII_HEAD) > 128 * 1024
+
+    encoding, _ = detect_encoding(data)
+    assert codecs.lookup(encoding).name == "cp1252"
+    assert detect_stream_encoding(io.BytesIO(data), len(data))[0] == encoding
+    assert read_text_file(data).endswith("Café naïve résumé “quoted” — déjà vu.\n")
+
+
+def test_pure_ascii_reads_as_utf8():
+    assert detect_encoding(_ASCII_HEAD)[0] == "utf-8"
+
+
+def test_bom_wins():
+    assert detect_encoding(codecs.BOM_UTF8 + "Ünïcode".encode("utf-8")) == ("utf-8-sig", 1.0)
+    report = {}
+    assert read_text_file("hé".encode("utf-16"), report) == "hé"
+    assert report["encoding"] == "utf-16"
+
+
+def test_multibyte_characters_split_across_blocks():
+    text = "naïve café " * 1000
+    assert "".join(iter_decoded(text.encode("utf-8"), "utf-8", block_size=7)) == text
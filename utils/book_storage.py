@@ -0,0 +1,151 @@
+# utils/book_storage.py
+"""Large-book ingestion.
+
+The upload is streamed into GridFS, then read back and extracted
+incrementally; cleaned text is cut into blocks of ``TEXT_BLOCK_CHARS``
+characters and stored zlib-compressed in ``book_text_blocks``. The book
+document only references the blocks, so neither RAM nor MongoDB's 16 MB
+document limit bounds the book size.
+"""
+import zlib
+from datetime import datetime
+
+from bson.binary import Binary
+
+from backend.structure import build_chapter_index, find_headings
+from backend.text_extractor import iter_clean_lines, iter_extracted_text
+from config.settings import TEXT_BLOCK_CHARS
+from utils.database import books, book_text_blocks, uploads_fs, oid
+
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+
+
+def store_upload(stream, filename, user_id):
+    """Stream a binary file object into GridFS; returns the file id."""
+    stream.seek(0)
+    return uploads_fs.upload_from_stream(
+        filename,
+        stream,
+        chunk_size_bytes=UPLOAD_CHUNK_BYTES,
+        metadata={"user_id": oid(user_id), "uploaded_at": datetime.utcnow()}
+    )
+
+
+def _iter_blocks(lines, block_chars):
+    block = []
+    size = 0
+    for line in lines:
+        block.append(line)
+        size += len(line) + 1
+        if size >= block_chars:
+            yield "\n".join(block)
+            block = []
+            size = 0
+    if block:
+        yield "\n".join(block)
+
+
+def ingest_large_book(user_id, title, author, stream, filename, file_type,
+                      block_chars=TEXT_BLOCK_CHARS):
+    """Store, extract and clean a large upload; returns (book_id, preview)."""
+    file_id = store_upload(stream, filename, user_id)
+
+    book_id = books.insert_one({
+        "user_id": oid(user_id),
+        "title": title,
+        "author": author,
+        "text": None,
+        "text_storage": "blocks",
+        "upload_file_id": file_id,
+        "status": "uploaded",
+        "created_at": datetime.utcnow()
+    }).inserted_id
+
+    report = {}
+    blocks = 0
+    chars = 0
+    words = 0
+    headings = []
+    preview = ""
+
+    try:
+        with uploads_fs.open_download_stream(file_id) as grid_out:
+            pieces = iter_extracted_text(grid_out, file_type, grid_out.length, report)
+            for seq, block in enumerate(_iter_blocks(iter_clean_lines(pieces), block_chars)):
+                book_text_blocks.insert_one({
+                    "book_id": book_id,
+                    "seq": seq,
+                    "chars": len(block),
+                    "data": Binary(zlib.compress(block.encode("utf-8"), 6))
+                })
+                if not preview:
+                    preview = block[:1000]
+                # blocks end on line boundaries, so headings never straddle two
+                block_start = chars + (1 if seq else 0)
+                headings.extend(find_headings(block, block_start))
+                blocks += 1
+                chars = block_start + len(block)
+                words += len(block.split())
+    except Exception:
+        book_text_blocks.delete_many({"book_id": book_id})
+        books.delete_one({"_id": book_id})
+        uploads_fs.delete(file_id)
+        raise
+
+    if not blocks:
+        book_text_blocks.delete_many({"book_id": book_id})
+        books.delete_one({"_id": book_id})
+        uploads_fs.delete(file_id)
+        raise ValueError("Extracted text is empty")
+
+    books.update_one({"_id": book_id}, {"$set": {
+        "text_blocks": blocks,
+        "char_count": chars,
+        "word_count": words,
+        "chapters": build_chapter_index(headings, chars),
+        "extraction": report
+    }})
+    return book_id, preview
+
+
+def iter_book_text(book):
+    """Yield a book's cleaned text block by block (inline books: one block)."""
+    if book.get("text_storage") != "blocks":
+        text = book.get("text") or book.get("raw_text")
+        if text:
+            yield text
+        return
+
+    cursor = book_text_blocks.find({"book_id": book["_id"]}).sort("seq", 1)
+    for doc in cursor:
+        yield zlib.decompress(doc["data"]).decode("utf-8")
+
+
+def get_book_text(book):
+    return "\n".join(iter_book_text(book))
+
+
+def get_book_text_range(book, start, end):
+    """Characters ``start:end`` of the book, decompressing only the blocks
+    that overlap the range."""
+    if book.get("text_storage") != "blocks":
+        return get_book_text(book)[start:end]
+
+    wanted = []
+    first_offset = None
+    offset = 0
+    sizes = book_text_blocks.find({"book_id": book["_id"]}, {"seq": 1, "chars": 1})
+    for doc in sizes.sort("seq", 1):
+        block_end = offset + doc["chars"]
+        if block_end > start and offset < end:
+            wanted.append(doc["seq"])
+            if first_offset is None:
+                first_offset = offset
+        offset = block_end + 1
+
+    if not wanted:
+        return ""
+    cursor = book_text_blocks.find({"book_id": book["_id"], "seq": {"$in": wanted}})
+    text = "\n".join(zlib.decompress(doc["data"]).decode("utf-8")
+                     for doc in cursor.sort("seq", 1))
+    return text[start - first_offset:end - first_offset]
@@ -0,0 +1,169 @@
+# utils/cache.py
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+
+from pymongo.errors import PyMongoError
+
+logger = logging.getLogger(__name__)
+
+
+def content_key(*parts):
+    """SHA-256 over the given parts; dicts are serialized with sorted keys."""
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, dict):
+            part = json.dumps(part, sort_keys=True, default=str)
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        h.update(part)
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+# ---------- IN-PROCESS TIER ----------
+class LRUCache:
+    """Thread-safe LRU with a maximum entry count and per-entry TTL."""
+
+    def __init__(self, max_entries=1024, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            value, stored_at = item
+            if self.ttl and time.time() - stored_at > self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+# ---------- PERSISTENT TIER ----------
+class MongoCache:
+    """Cache entries stored in a MongoDB collection.
+
+    Expiry relies on a TTL index over ``created_at`` (see utils/init_db.py);
+    the entry count is trimmed every ``trim_every`` writes by removing the
+    least recently used entries.
+    """
+
+    def __init__(self, collection, ttl=None, max_entries=None, trim_every=500):
+        self.collection = collection
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.trim_every = trim_every
+        self._writes = 0
+
+    def get(self, key):
+        doc = self.collection.find_one_and_update(
+            {"_id": key},
+            {"$set": {"last_used": datetime.utcnow()}},
+            projection={"value": 1, "created_at": 1}
+        )
+        if not doc:
+            return None
+        # the TTL monitor only runs once a minute
+        if self.ttl and doc["created_at"] < datetime.utcnow() - timedelta(seconds=self.ttl):
+            return None
+        return doc["value"]
+
+    def set(self, key, value):
+        now = datetime.utcnow()
+        self.collection.update_one(
+            {"_id": key},
+            {"$set": {"value": value, "created_at": now, "last_used": now}},
+            upsert=True
+        )
+        self._writes += 1
+        if self.max_entries and self._writes % self.trim_every == 0:
+            self.trim()
+
+    def trim(self):
+        excess = self.collection.estimated_document_count() - self.max_entries
+        if excess <= 0:
+            return
+        stale = self.collection.find({}, {"_id": 1}) \
+                               .sort("last_used", 1) \
+                               .limit(excess)
+        self.collection.delete_many({"_id": {"$in": [d["_id"] for d in stale]}})
+
+
+# ---------- TIERED CACHE ----------
+class TieredCache:
+    """LRU in front of an optional persistent tier, with hit/miss counters.
+
+    Persistent-tier failures are logged and treated as misses so a database
+    outage never breaks the caller.
+    """
+
+    def __init__(self, memory, persistent=None):
+        self.memory = memory
+        self.persistent = persistent
+        self._stats = {"memory_hits": 0, "persistent_hits": 0, "misses": 0, "stores": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def get(self, key):
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("memory_hits")
+            return value
+
+        if self.persistent is not None:
+            try:
+                value = self.persistent.get(key)
+            except PyMongoError as e:
+                logger.warning("Cache lookup failed: %s", e)
+                value = None
+            if value is not None:
+                self.memory.set(key, value)
+                self._count("persistent_hits")
+                return value
+
+        self._count("misses")
+        return None
+
+    def set(self, key, value):
+        self.memory.set(key, value)
+        self._count("stores")
+        if self.persistent is not None:
+            try:
+                self.persistent.set(key, value)
+            except PyMongoError as e:
+                logger.warning("Cache write failed: %s", e)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        hits = stats["memory_hits"] + stats["persistent_hits"]
+        lookups = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / lookups, 3) if lookups else 0.0
+        stats["memory_entries"] = len(self.memory)
+        return stats
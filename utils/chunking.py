@@ -1,14 +1,214 @@
 # utils/chunking.py
+import hashlib
+from functools import lru_cache
 
-def chunk_text(text, chunk_size=1000, overlap=150):
-    words = text.split()
+from transformers import AutoTokenizer
+
+from backend.segmenter import segment_sentences
+from config.settings import SUMMARIZER_MODEL, MAX_INPUT_TOKENS
+
+
+@lru_cache(maxsize=None)
+def get_tokenizer(model_name=SUMMARIZER_MODEL):
+    return AutoTokenizer.from_pretrained(model_name, use_fast=True)
+
+
+def token_budget(tokenizer, max_tokens=None):
+    """Tokens available for text once the model's special tokens are added."""
+    limit = min(max_tokens or MAX_INPUT_TOKENS, tokenizer.model_max_length)
+    return limit - tokenizer.num_special_tokens_to_add()
+
+
+# ---------------- LINEAR PACKER ----------------
+def pack_spans(lengths, budget, overlap=0):
+    """Group consecutive items into windows of at most ``budget``.
+
+    ``lengths`` are per-item sizes (tokens, words, ...). Returns a list of
+    ``(first, last)`` index ranges, ``last`` exclusive. Each window after
+    the first starts with the trailing items of the previous one whose total
+    stays within ``overlap``, dropped from the front if they would crowd out
+    the next item. An item larger than ``budget`` gets a window of its own.
+    Uses prefix sums and two forward-only pointers, so it is O(n).
+    """
+    n = len(lengths)
+    prefix = [0] * (n + 1)
+    for i, size in enumerate(lengths):
+        prefix[i + 1] = prefix[i] + size
+
+    windows = []
+    start = 0
+    end = 0
+    carry = 0
+    while start < n:
+        end = max(end, start + 1)
+        while end < n and prefix[end + 1] - prefix[start] <= budget:
+            end += 1
+        windows.append((start, end))
+        if end == n:
+            break
+
+        # smallest carry point whose tail fits the overlap and leaves room
+        # for the next item; it only ever moves forward
+        carry = max(carry, start + 1)
+        while carry < end and (prefix[end] - prefix[carry] > overlap or
+                               prefix[end + 1] - prefix[carry] > budget):
+            carry += 1
+        start = carry
+
+    return windows
+
+
+# ---------------- TOKEN-BUDGET CHUNKER ----------------
+def chunk_by_tokens(text, max_tokens=None, overlap_tokens=0, tokenizer=None,
+                    sentences=None):
+    """Pack sentences into chunks that fill the model's token window.
+
+    Each chunk is a dict with ``chunk_id``, ``text``, ``token_count`` and
+    ``input_ids`` (special tokens included) so the summarizer can feed the
+    IDs straight to the model without tokenizing a second time. Pass
+    ``sentences`` when the text has already been segmented.
+    """
+    tokenizer = tokenizer or get_tokenizer()
+    budget = token_budget(tokenizer, max_tokens)
+
+    if sentences is None:
+        sentences = segment_sentences(text)
+    if not sentences:
+        return []
+
+    pieces = _sentence_pieces(sentences, tokenizer, budget)
+    return _build_chunks(pieces, pack_spans([len(ids) for _, ids in pieces],
+                                            budget, overlap_tokens), tokenizer)
+
+
+def _spaced(sentences):
+    # byte-level BPE (BART) encodes the space before a word into the word's
+    # token, so every sentence but the first is tokenized with the space that
+    # joins it to the previous one; the concatenated IDs then match the
+    # space-joined chunk text
+    return [sent if i == 0 else " " + sent for i, sent in enumerate(sentences)]
+
+
+def _sentence_pieces(sentences, tokenizer, budget):
+    encoded = tokenizer(_spaced(sentences), add_special_tokens=False)["input_ids"]
+
+    # sentences longer than the whole window are hard-split on token boundaries
+    pieces = []
+    for sent, ids in zip(sentences, encoded):
+        if len(ids) <= budget:
+            pieces.append((sent, ids))
+            continue
+        for start in range(0, len(ids), budget):
+            part = ids[start:start + budget]
+            pieces.append((tokenizer.decode(part).strip(), part))
+    return pieces
+
+
+def token_spans(text, spans, tokenizer, budget):
+    """``(start, end, tokens)`` for each sentence span of ``text``.
+
+    Like ``_sentence_pieces`` but in character offsets: a sentence longer
+    than ``budget`` is split on token boundaries using the fast tokenizer's
+    offset mapping.
+    """
+    encoded = tokenizer(_spaced([text[s:e] for s, e in spans]), add_special_tokens=False,
+                        return_offsets_mapping=True)["offset_mapping"]
+    pieces = []
+    for n, ((start, end), offsets) in enumerate(zip(spans, encoded)):
+        if len(offsets) <= budget:
+            pieces.append((start, end, len(offsets)))
+            continue
+        # offsets count the leading space added by _spaced
+        shift = start - (1 if n else 0)
+        for i in range(0, len(offsets), budget):
+            part = offsets[i:i + budget]
+            pieces.append((max(shift + part[0][0], start), shift + part[-1][1], len(part)))
+    return pieces
+
+
+def _build_chunks(pieces, windows, tokenizer):
     chunks = []
+    for first, last in windows:
+        window = pieces[first:last]
+        ids = [i for _, piece_ids in window for i in piece_ids]
+        chunks.append({
+            "chunk_id": len(chunks) + 1,
+            "text": " ".join(sent for sent, _ in window),
+            "token_count": len(ids),
+            "input_ids": tokenizer.build_inputs_with_special_tokens(ids)
+        })
+    return chunks
+
+
+# ---------------- CONTENT-DEFINED CHUNKER ----------------
+_CDC_WINDOW = 3                 # sentences in the rolling hash
+_CDC_BASE = 1_000_003
+_MASK64 = (1 << 64) - 1
+
+
+def _sentence_hash(sentence):
+    digest = hashlib.blake2b(sentence.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
 
+def content_defined_spans(pieces, budget, window=_CDC_WINDOW):
+    """Cut points chosen by content rather than position.
+
+    A rolling hash over the last ``window`` sentences decides whether to cut
+    after a sentence. Once a chunk holds 3/4 of the budget, each sentence
+    cuts with probability (its tokens / ``budget`` * 10), so chunks average
+    about 83% of ``budget`` and only ~8% hit the budget and get cut by
+    size. An edit only moves the boundaries next to it; the chunking
+    resynchronizes at the next content-defined cut, so the rest of the book
+    keeps identical chunks.
+    """
+    target = max(budget // 10, 1)
+    min_tokens = budget * 3 // 4
+    top = _CDC_BASE ** (window - 1) & _MASK64
+
+    windows = []
+    hashes = []
+    rolling = 0
     start = 0
-    while start < len(words):
-        end = start + chunk_size
-        chunk = words[start:end]
-        chunks.append(" ".join(chunk))
-        start = end - overlap   # overlap for context
+    tokens = 0
+    for i, (sent, ids) in enumerate(pieces):
+        if tokens and tokens + len(ids) > budget:
+            windows.append((start, i))
+            start, tokens = i, 0
+        tokens += len(ids)
+
+        h = _sentence_hash(sent)
+        hashes.append(h)
+        if len(hashes) > window:
+            rolling = (rolling - hashes[-window - 1] * top) & _MASK64
+        rolling = (rolling * _CDC_BASE + h) & _MASK64
+
+        # mix before thresholding so the low-order hash bits matter too
+        mixed = hashlib.blake2b(rolling.to_bytes(8, "big"), digest_size=8).digest()
+        threshold = (_MASK64 * min(len(ids), target)) // target
+        if tokens >= min_tokens and int.from_bytes(mixed, "big") < threshold:
+            windows.append((start, i + 1))
+            start, tokens = i + 1, 0
+
+    if start < len(pieces):
+        windows.append((start, len(pieces)))
+    return windows
+
+
+def chunk_by_content(text, max_tokens=None, tokenizer=None, sentences=None):
+    """Like ``chunk_by_tokens`` (no overlap), but with content-defined
+    boundaries, so an edited version of a text reuses most of its chunks."""
+    tokenizer = tokenizer or get_tokenizer()
+    budget = token_budget(tokenizer, max_tokens)
+
+    if sentences is None:
+        sentences = segment_sentences(text)
+    if not sentences:
+        return []
+
+    pieces = _sentence_pieces(sentences, tokenizer, budget)
+    return _build_chunks(pieces, content_defined_spans(pieces, budget), tokenizer)
+
 
-    return chunks
\ No newline at end of file
+def chunk_text(text, max_tokens=None, overlap_tokens=0):
+    return [c["text"] for c in chunk_by_tokens(text, max_tokens, overlap_tokens)]
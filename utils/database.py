@@ -2,7 +2,9 @@
 import os
 from datetime import datetime
 from bson.objectid import ObjectId
-from pymongo import MongoClient, DESCENDING
+from pymongo import MongoClient, DESCENDING, ReturnDocument
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
 from dotenv import load_dotenv
 import bcrypt
 
@@ -15,6 +17,16 @@ db = client["ai_project_db"]
 users = db.users
 books = db.books
 summaries = db.summaries
+book_versions = db.book_versions
+chapter_summaries = db.chapter_summaries
+chunk_summary_cache = db.chunk_summary_cache
+extraction_cache = db.extraction_cache
+jobs = db.jobs
+book_text_blocks = db.book_text_blocks
+
+# raw uploads too large to keep in memory / in a book document
+uploads_fs = GridFSBucket(db, bucket_name="uploads")
+dead_jobs = db.dead_jobs
 
 def oid(x):
     return ObjectId(str(x))
@@ -41,15 +53,21 @@ def verify_user(email, password):
     return None
 
 # ---------- BOOK ----------
-def create_book(user_id, title,author, text):
+def create_book(user_id, title,author, text, chapters=None):
     return books.insert_one({
         "user_id": oid(user_id),
         "title": title,
         "author": author,  
         "text": text,
+        "chapters": chapters or [],
+        "version": 1,
+        "status": "uploaded",
         "created_at": datetime.utcnow()
     }).inserted_id
 
+def get_book_by_id(book_id):
+    return books.find_one({"_id": oid(book_id)})
+
 def update_book_status(book_id, status):
     books.update_one(
         {"_id": oid(book_id)},
@@ -57,16 +75,58 @@ def update_book_status(book_id, status):
     )
 
 
-def get_books(user_id):
+def add_book_version(book_id, text, chapters=None):
+    """Replace a book's text with a revised manuscript; the previous text is
+    archived in book_versions. Returns the new version number."""
+    book = get_book_by_id(book_id)
+    if not book:
+        raise ValueError(f"Book not found: {book_id}")
+    if book.get("text_storage") == "blocks":
+        raise ValueError("Versioning is only supported for books stored inline")
+
+    version = book.get("version", 1)
+    book_versions.insert_one({
+        "book_id": book["_id"],
+        "version": version,
+        "text": book.get("text"),
+        "chapters": book.get("chapters", []),
+        "created_at": book.get("updated_at", book["created_at"])
+    })
+    books.update_one({"_id": book["_id"]}, {"$set": {
+        "text": text,
+        "chapters": chapters or [],
+        "version": version + 1,
+        "status": "uploaded",
+        "updated_at": datetime.utcnow()
+    }})
+    return version + 1
+
+
+def get_books(user_id, fields=None):
+    """``fields`` is a projection, e.g. ``{"title": 1}`` to skip the text."""
     return list(books.find(
-        {"user_id": oid(user_id)}
+        {"user_id": oid(user_id)}, fields
     ).sort("created_at", DESCENDING))
 
 def delete_book(book_id, user_id):
+    book = books.find_one({"_id": oid(book_id), "user_id": oid(user_id)})
+    if not book:
+        return
+
     summaries.delete_many({
         "book_id": oid(book_id),
         "user_id": oid(user_id)
     })
+    chapter_summaries.delete_many({"book_id": oid(book_id)})
+    book_versions.delete_many({"book_id": oid(book_id)})
+
+    # large books: compressed text blocks + the original upload in GridFS
+    book_text_blocks.delete_many({"book_id": oid(book_id)})
+    if book.get("upload_file_id"):
+        try:
+            uploads_fs.delete(book["upload_file_id"])
+        except NoFile:
+            pass
 
     books.delete_one({
         "_id": oid(book_id),
@@ -83,8 +143,103 @@ def save_summary(book_id, user_id, summary):
         "created_at": datetime.utcnow()
     })
 
-def get_summary(book_id):
-    return summaries.find_one({"book_id": oid(book_id)})
+def create_summary(book_id, user_id, summary_text,
+                   summary_length="medium",
+                   summary_style="simple",
+                   chunk_summaries=None,
+                   processing_time=0.0):
+    return summaries.insert_one({
+        "book_id": oid(book_id),
+        "user_id": oid(user_id),
+        "summary_text": summary_text,
+        "summary_length": summary_length,
+        "summary_style": summary_style,
+        "chunk_summaries": chunk_summaries or [],
+        "processing_time": float(processing_time),
+        "created_at": datetime.utcnow()
+    }).inserted_id
+
+def get_summary(book_id, summary_length=None, summary_style=None):
+    # latest first: re-summarizing a chapter produces a new book summary
+    q = {"book_id": oid(book_id)}
+    if summary_length:
+        q["summary_length"] = summary_length
+    if summary_style:
+        q["summary_style"] = summary_style
+    return summaries.find_one(q, sort=[("created_at", DESCENDING)])
+
+def get_summaries(book_id):
+    return list(summaries.find(
+        {"book_id": oid(book_id)}
+    ).sort("created_at", DESCENDING))
+
+# ---------- CHAPTERS ----------
+def set_book_chapters(book_id, chapters):
+    books.update_one(
+        {"_id": oid(book_id)},
+        {"$set": {"chapters": chapters}}
+    )
+
+def save_chapter_summary(book_id, user_id, chapter, summary_text,
+                         summary_length="medium",
+                         summary_style="simple",
+                         chunk_summaries=None,
+                         processing_time=0.0):
+    """One summary per chapter and length/style; re-running replaces it."""
+    return chapter_summaries.find_one_and_update(
+        {
+            "book_id": oid(book_id),
+            "chapter_index": chapter["index"],
+            "summary_length": summary_length,
+            "summary_style": summary_style
+        },
+        {"$set": {
+            "user_id": oid(user_id),
+            "chapter_title": chapter["title"],
+            "summary_text": summary_text,
+            "chunk_summaries": chunk_summaries or [],
+            "processing_time": float(processing_time),
+            "created_at": datetime.utcnow()
+        }},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )["_id"]
+
+def get_chapter_summaries(book_id, summary_length=None, summary_style=None):
+    q = {"book_id": oid(book_id)}
+    if summary_length:
+        q["summary_length"] = summary_length
+    if summary_style:
+        q["summary_style"] = summary_style
+    return list(chapter_summaries.find(q).sort("chapter_index", 1))
+
+def _chapter_run(summary_length, summary_style):
+    # one pending list per length/style, so runs for different variants of
+    # the same book never overwrite each other
+    return f"chapter_runs.{summary_length}_{summary_style}.pending"
+
+def start_chapter_run(book_id, indexes, summary_length, summary_style):
+    """Mark chapters as pending for a length/style; joins a run in progress."""
+    books.update_one(
+        {"_id": oid(book_id)},
+        {"$addToSet": {_chapter_run(summary_length, summary_style): {"$each": list(indexes)}}}
+    )
+
+def finish_chapter(book_id, index, summary_length, summary_style):
+    """Take a chapter off the pending list; True for the job that empties it.
+
+    The pull only matches while the chapter is still pending, so a retried
+    job can't report the run finished a second time.
+    """
+    pending = _chapter_run(summary_length, summary_style)
+    book = books.find_one_and_update(
+        {"_id": oid(book_id), pending: index},
+        {"$pull": {pending: index}},
+        return_document=ReturnDocument.AFTER
+    )
+    if book is None:
+        return False
+    return not book["chapter_runs"][f"{summary_length}_{summary_style}"]["pending"]
 
 # ---------- SEARCH ----------
 def search_books(user_id, title=None, status=None):
@@ -0,0 +1,100 @@
+# utils/extractive.py
+"""Extractive pre-filter ("fast mode").
+
+Scores sentences with TF-IDF / TextRank inside fixed windows (or given
+sections) and keeps the top fraction, in original order, so the
+abstractive model only sees the sentences that matter most.
+"""
+import math
+import re
+
+import numpy as np
+
+from backend.preprocessing import segment_sentences
+from config.settings import EXTRACTIVE_RATIO, EXTRACTIVE_WINDOW
+
+WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def _tfidf_matrix(sentences):
+    vocab = {}
+    rows, cols = [], []
+    for i, sent in enumerate(sentences):
+        for word in WORD_RE.findall(sent.lower()):
+            rows.append(i)
+            cols.append(vocab.setdefault(word, len(vocab)))
+
+    tf = np.zeros((len(sentences), max(len(vocab), 1)), dtype=np.float32)
+    np.add.at(tf, (rows, cols), 1.0)
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1 + len(sentences)) / (1 + df)) + 1.0
+    matrix = tf * idf
+
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-9), vocab
+
+
+def _tfidf_scores(sentences):
+    matrix, _ = _tfidf_matrix(sentences)
+    # centrality: similarity of each sentence to the window as a whole
+    centroid = matrix.mean(axis=0)
+    return matrix @ centroid
+
+
+def _textrank_scores(sentences, damping=0.85, iterations=50, tol=1e-6):
+    matrix, _ = _tfidf_matrix(sentences)
+    sim = matrix @ matrix.T
+    np.fill_diagonal(sim, 0.0)
+
+    out_weight = sim.sum(axis=1, keepdims=True)
+    transition = np.divide(sim, out_weight, out=np.zeros_like(sim), where=out_weight > 0)
+
+    n = len(sentences)
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tol:
+            return updated
+        scores = updated
+    return scores
+
+
+SCORERS = {
+    "tfidf": _tfidf_scores,
+    "textrank": _textrank_scores,
+}
+
+
+def select_sentences(sentences, ratio, method="textrank"):
+    """Indices of the top ``ratio`` of ``sentences``, in original order."""
+    keep = max(1, math.ceil(len(sentences) * ratio))
+    if keep >= len(sentences):
+        return list(range(len(sentences)))
+    scores = SCORERS[method](sentences)
+    top = np.argpartition(-scores, keep - 1)[:keep]
+    return sorted(top.tolist())
+
+
+def extractive_filter(text, ratio=EXTRACTIVE_RATIO, window=EXTRACTIVE_WINDOW,
+                      sections=None, method="textrank"):
+    """Keep the top ``ratio`` of sentences in each section of ``text``.
+
+    ``sections`` are ``(start, end)`` character offsets (e.g. chapters);
+    without them the text is scored in windows of ``window`` sentences.
+    A ratio of 0 or >= 1 returns the text unchanged.
+    """
+    if not ratio or ratio >= 1:
+        return text
+
+    if sections:
+        groups = [segment_sentences(text[start:end]) for start, end in sections]
+    else:
+        sentences = segment_sentences(text)
+        groups = [sentences[i:i + window] for i in range(0, len(sentences), window)]
+
+    kept = []
+    for group in groups:
+        if group:
+            kept.extend(group[i] for i in select_sentences(group, ratio, method))
+    return " ".join(kept)
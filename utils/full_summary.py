@@ -1,6 +1,407 @@
-from utils.summarizer import generate_summary
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain
 
-def summarize_large_text(text):
-    chunks = [text[i:i+1000] for i in range(0, len(text), 1000)]
-    summaries = [generate_summary(c) for c in chunks]
-    return " ".join(summaries)
+from config.settings import (
+    SUMMARY_BATCH_SIZE,
+    SUMMARY_WORKERS,
+    SUMMARY_WORKER_THREADS,
+    MAX_REDUCE_LEVELS,
+    EXTRACTIVE_RATIO,
+    SUMMARIZER_POOL_WORKERS,
+    CHUNK_STRATEGY
+)
+from utils.chunking import chunk_by_tokens, chunk_by_content
+from utils.database import create_summary, get_summary
+from utils.extractive import extractive_filter
+from utils.post_processing import apply_style
+from utils.summarizer import generate_summaries, length_profile
+from utils.summary_cache import summary_cache, chunk_key
+
+# rough word budget of the final summary for each summary_length
+SUMMARY_TARGET_WORDS = {"short": 80, "medium": 150, "long": 250}
+
+
+def _chunk_text(chunk):
+    return chunk["text"] if isinstance(chunk, dict) else chunk
+
+
+def summarize_chunks(chunks, batch_size=SUMMARY_BATCH_SIZE, summary_length="medium",
+                     **generate_kwargs):
+    """Summarize chunks, running the model only for chunks not in the cache."""
+    generate_kwargs = {**length_profile(summary_length), **generate_kwargs}
+    keys = [chunk_key(_chunk_text(c), generate_kwargs) for c in chunks]
+    results = [summary_cache.get(k) for k in keys]
+
+    misses = [i for i, r in enumerate(results) if r is None]
+    if misses:
+        fresh = generate_summaries(
+            [chunks[i] for i in misses],
+            batch_size=batch_size,
+            **generate_kwargs
+        )
+        for i, summary in zip(misses, fresh):
+            summary_cache.set(keys[i], summary)
+            results[i] = summary
+
+    return results
+
+
+# ---------------- PROCESS POOL ----------------
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _init_worker(threads):
+    import torch
+    torch.set_num_threads(threads)
+
+
+def _get_pool(workers):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a process that already runs torch threads can deadlock
+            _pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(SUMMARY_WORKER_THREADS,)
+            )
+        return _pool
+
+
+def _summarize_task(chunks, batch_size, summary_length):
+    return summarize_chunks(chunks, batch_size=batch_size, summary_length=summary_length)
+
+
+def map_chunks(chunks, batch_size=SUMMARY_BATCH_SIZE, workers=SUMMARY_WORKERS,
+               summary_length="medium"):
+    """Map step: summarize chunks across the worker pool, keeping input order."""
+    # the shared-weight inference pool already parallelizes inside generate_summaries
+    if workers <= 1 or len(chunks) <= batch_size or SUMMARIZER_POOL_WORKERS:
+        return summarize_chunks(chunks, batch_size=batch_size, summary_length=summary_length)
+
+    # bucket by length before splitting into tasks so each task pads evenly
+    order = sorted(range(len(chunks)), key=lambda i: len(_chunk_text(chunks[i])))
+    tasks = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+
+    pool = _get_pool(workers)
+    futures = [
+        pool.submit(_summarize_task, [chunks[i] for i in task], batch_size, summary_length)
+        for task in tasks
+    ]
+
+    results = [None] * len(chunks)
+    for task, future in zip(tasks, futures):
+        for i, summary in zip(task, future.result()):
+            results[i] = summary
+    return results
+
+
+# ---------------- MAP-REDUCE ----------------
+def _word_count(texts):
+    return sum(len(t.split()) for t in texts)
+
+
+def reduce_summaries(summaries, summary_length="medium", batch_size=SUMMARY_BATCH_SIZE,
+                     workers=SUMMARY_WORKERS, fitted=False):
+    """Reduce step: summarize groups of summaries level by level until a
+    single pass produces the ``summary_length`` output.
+
+    Intermediate levels use the medium profile; only the final pass decodes
+    with the requested length. ``fitted`` means ``summaries`` were already
+    generated with that length. Returns the final texts and the
+    ``chunk_summaries`` entries for levels 1 and up.
+    """
+    target = SUMMARY_TARGET_WORDS.get(summary_length, SUMMARY_TARGET_WORDS["medium"])
+    current = list(summaries)
+    entries = []
+
+    level = 0
+    while current and level < MAX_REDUCE_LEVELS:
+        # group summaries into model-sized windows on sentence boundaries
+        groups = chunk_by_tokens(" ".join(current))
+        final = len(groups) == 1
+        if final and (fitted or _word_count(current) <= target):
+            break
+
+        reduced = map_chunks(groups, batch_size=batch_size, workers=workers,
+                             summary_length=summary_length if final else "medium")
+
+        # a pass that no longer shrinks the text will not converge
+        if _word_count(reduced) >= _word_count(current):
+            break
+
+        current = reduced
+        level += 1
+        entries.extend(
+            {"level": level, "chunk": i, "text": s} for i, s in enumerate(current, start=1)
+        )
+        if final:
+            break
+
+    return current, entries
+
+
+def _map_length(chunks, summary_length):
+    # a one-chunk book is summarized straight to the requested length
+    return summary_length if len(chunks) == 1 else "medium"
+
+
+# ---------------- INCREMENTAL (BOOK VERSIONS) ----------------
+def book_chunks(text, extractive_ratio=EXTRACTIVE_RATIO):
+    text = extractive_filter(text, extractive_ratio)
+    if CHUNK_STRATEGY == "content":
+        return chunk_by_content(text)
+    return chunk_by_tokens(text)
+
+
+def chunk_hashes(chunks, map_length):
+    # the summary cache key: text + model + generation parameters
+    profile = length_profile(map_length)
+    return [chunk_key(_chunk_text(c), profile) for c in chunks]
+
+
+def reusable_chunks(*summary_docs):
+    """``{hash: summary}`` for the level-0 entries of stored summaries."""
+    reuse = {}
+    for doc in summary_docs:
+        for entry in (doc or {}).get("chunk_summaries", []):
+            if entry.get("level") == 0 and entry.get("hash"):
+                reuse[entry["hash"]] = entry["text"]
+    return reuse
+
+
+def _level0_entries(mapped, hashes):
+    return [
+        {"level": 0, "chunk": i, "text": s, "hash": h}
+        for i, (s, h) in enumerate(zip(mapped, hashes), start=1)
+    ]
+
+
+def map_reduce_summarize(text, summary_length="medium",
+                         batch_size=SUMMARY_BATCH_SIZE, workers=SUMMARY_WORKERS,
+                         extractive_ratio=EXTRACTIVE_RATIO, reuse=None):
+    """Summarize chunks in parallel, then reduce the chunk summaries.
+
+    With ``extractive_ratio`` set, only that fraction of sentences (fast
+    mode, see utils.extractive) reaches the model. ``reuse`` maps chunk
+    hashes to summaries from an earlier version of the text (see
+    ``reusable_chunks``); only chunks not in it are summarized. Returns the
+    final summary and every level's outputs as ``chunk_summaries`` entries
+    (``level`` 0 is the map step and carries each chunk's ``hash``).
+    """
+    chunks = book_chunks(text, extractive_ratio)
+    if not chunks:
+        return {"summary": "", "chunk_summaries": [], "reused": 0}
+
+    map_length = _map_length(chunks, summary_length)
+    hashes = chunk_hashes(chunks, map_length)
+    mapped, reused = _map_reusing(chunks, hashes, reuse, batch_size, workers, map_length)
+
+    final, entries = reduce_summaries(mapped, summary_length, batch_size, workers,
+                                      fitted=map_length == summary_length)
+    return {
+        "summary": " ".join(final),
+        "chunk_summaries": _level0_entries(mapped, hashes) + entries,
+        "reused": reused
+    }
+
+
+def _map_reusing(chunks, hashes, reuse, batch_size, workers, map_length):
+    mapped = [(reuse or {}).get(h) for h in hashes]
+    todo = [i for i, s in enumerate(mapped) if s is None]
+
+    fresh = map_chunks([chunks[i] for i in todo], batch_size=batch_size, workers=workers,
+                       summary_length=map_length)
+    for i, summary in zip(todo, fresh):
+        mapped[i] = summary
+    return mapped, len(chunks) - len(todo)
+
+
+def map_reduce_blocks(blocks, summary_length="medium",
+                      batch_size=SUMMARY_BATCH_SIZE, workers=SUMMARY_WORKERS,
+                      extractive_ratio=EXTRACTIVE_RATIO, reuse=None):
+    """``map_reduce_summarize`` over text that arrives in blocks (see
+    ``utils.book_storage.iter_book_text``).
+
+    Each block is chunked and mapped on its own, so only one block's text
+    and tokens are held at a time; the reduce step runs once over the chunk
+    summaries of every block. Same return value.
+    """
+    mapped = []
+    hashes = []
+    reused = 0
+    for text in blocks:
+        chunks = book_chunks(text, extractive_ratio)
+        block_hashes = chunk_hashes(chunks, "medium")
+        block_mapped, block_reused = _map_reusing(chunks, block_hashes, reuse,
+                                                  batch_size, workers, "medium")
+        mapped.extend(block_mapped)
+        hashes.extend(block_hashes)
+        reused += block_reused
+
+    if not mapped:
+        return {"summary": "", "chunk_summaries": [], "reused": 0}
+
+    final, entries = reduce_summaries(mapped, summary_length, batch_size, workers)
+    return {
+        "summary": " ".join(final),
+        "chunk_summaries": _level0_entries(mapped, hashes) + entries,
+        "reused": reused
+    }
+
+
+# ---------------- STREAMING ----------------
+def summarize_stream(text, summary_length="medium",
+                     batch_size=SUMMARY_BATCH_SIZE, workers=SUMMARY_WORKERS,
+                     extractive_ratio=EXTRACTIVE_RATIO, reuse=None):
+    """Generator version of ``map_reduce_summarize``.
+
+    Yields one event per chunk in reading order as soon as its summary is
+    ready (chunks found in ``reuse`` are ready immediately)::
+
+        {"done": False, "index": 3, "total": 40, "summary": "...",
+         "elapsed": 12.4, "eta": 153.0}
+
+    and finally ``{"done": True, "summary": ..., "chunk_summaries": [...],
+    "reused": 12}`` once the reduce step has run.
+    """
+    start = time.time()
+    chunks = book_chunks(text, extractive_ratio)
+    total = len(chunks)
+    map_length = _map_length(chunks, summary_length)
+    hashes = chunk_hashes(chunks, map_length)
+    mapped = [(reuse or {}).get(h) for h in hashes]
+    todo = [i for i, s in enumerate(mapped) if s is None]
+
+    # contiguous batches keep the output in reading order
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+    if workers > 1 and len(batches) > 1 and not SUMMARIZER_POOL_WORKERS:
+        pool = _get_pool(workers)
+        pending = [pool.submit(_summarize_task, [chunks[i] for i in b], batch_size, map_length)
+                   for b in batches]
+        results = (f.result() for f in pending)
+    else:
+        results = (summarize_chunks([chunks[i] for i in b], batch_size=batch_size,
+                                    summary_length=map_length)
+                   for b in batches)
+
+    emitted = 0
+    fresh_done = 0
+    # the empty first batch flushes reused chunks that lead the book
+    for batch, batch_summaries in chain([((), ())], zip(batches, results)):
+        for i, summary in zip(batch, batch_summaries):
+            mapped[i] = summary
+        fresh_done += len(batch)
+
+        while emitted < total and mapped[emitted] is not None:
+            emitted += 1
+            elapsed = time.time() - start
+            yield {
+                "done": False,
+                "index": emitted,
+                "total": total,
+                "summary": mapped[emitted - 1],
+                "elapsed": round(elapsed, 1),
+                "eta": round(elapsed / fresh_done * (len(todo) - fresh_done), 1)
+                       if fresh_done else 0.0,
+            }
+
+    final, entries = reduce_summaries(mapped, summary_length, batch_size, workers,
+                                      fitted=map_length == summary_length)
+    yield {
+        "done": True,
+        "summary": " ".join(final),
+        "chunk_summaries": _level0_entries(mapped, hashes) + entries,
+        "reused": total - len(todo),
+        "elapsed": round(time.time() - start, 1),
+    }
+
+
+def summarize_book_stream(book_id, user_id, text, summary_length="medium",
+                          summary_style="simple", workers=SUMMARY_WORKERS,
+                          extractive_ratio=EXTRACTIVE_RATIO, reuse=None):
+    """Stream chunk events, then save the summary; the final event gets
+    ``summary_id``."""
+    start = time.time()
+    for event in summarize_stream(text, summary_length=summary_length, workers=workers,
+                                  extractive_ratio=extractive_ratio, reuse=reuse):
+        if event["done"]:
+            event["summary_id"] = create_summary(
+                book_id=book_id,
+                user_id=user_id,
+                summary_text=event["summary"],
+                summary_length=summary_length,
+                summary_style=summary_style,
+                chunk_summaries=event["chunk_summaries"],
+                processing_time=round(time.time() - start, 2)
+            )
+        yield event
+
+
+def summarize_book(book_id, user_id, text, summary_length="medium",
+                   summary_style="simple", workers=SUMMARY_WORKERS,
+                   extractive_ratio=EXTRACTIVE_RATIO, reuse=None):
+    for event in summarize_book_stream(book_id, user_id, text, summary_length,
+                                       summary_style, workers, extractive_ratio, reuse):
+        if event["done"]:
+            return event["summary_id"], event["summary"]
+
+
+# ---------------- VARIANTS ----------------
+def level0_entries(chunk_summaries):
+    return sorted((e for e in chunk_summaries if e.get("level") == 0),
+                  key=lambda e: e["chunk"])
+
+
+def summary_variants(book_id, user_id, source, lengths=("short", "medium", "long"),
+                     styles=("simple",), batch_size=SUMMARY_BATCH_SIZE,
+                     workers=SUMMARY_WORKERS):
+    """Save other length / style variants of a stored summary.
+
+    Only the reduce step runs again, over ``source``'s level-0 chunk
+    summaries; intermediate reduce levels are shared through the summary
+    cache and styles are formatting on top of each length. Variants at
+    least as new as ``source`` are skipped. Returns
+    ``{(length, style): summary_id}`` for the ones created.
+    """
+    mapped = level0_entries(source.get("chunk_summaries", []))
+    if not mapped:
+        raise ValueError("Summary has no stored chunk summaries to reduce")
+
+    created = {}
+    for length in lengths:
+        wanted = []
+        for style in styles:
+            existing = get_summary(book_id, length, style)
+            if not existing or existing["created_at"] < source["created_at"]:
+                wanted.append(style)
+        if not wanted:
+            continue
+
+        start = time.time()
+        final, entries = reduce_summaries([e["text"] for e in mapped], length,
+                                          batch_size, workers)
+        text = " ".join(final)
+        elapsed = round(time.time() - start, 2)
+
+        for style in wanted:
+            created[(length, style)] = create_summary(
+                book_id=book_id,
+                user_id=user_id,
+                summary_text=apply_style(text, style),
+                summary_length=length,
+                summary_style=style,
+                chunk_summaries=mapped + entries,
+                processing_time=elapsed
+            )
+    return created
+
+
+def summarize_large_text(text, batch_size=SUMMARY_BATCH_SIZE, summary_length="medium"):
+    return map_reduce_summarize(text, summary_length=summary_length,
+                                batch_size=batch_size)["summary"]
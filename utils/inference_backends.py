@@ -0,0 +1,58 @@
+# utils/inference_backends.py
+import os
+
+import torch
+from transformers import AutoModelForSeq2SeqLM
+
+from config.settings import ONNX_MODEL_DIR
+
+
+# ---------- PYTORCH (fp32) ----------
+def load_pytorch(model_name):
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    return model
+
+
+# ---------- PYTORCH DYNAMIC INT8 ----------
+def load_int8(model_name):
+    # weights of every Linear layer are stored as int8, activations are
+    # quantized on the fly; no calibration data needed
+    model = load_pytorch(model_name)
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8
+    )
+
+
+# ---------- ONNX RUNTIME ----------
+def load_onnx(model_name):
+    try:
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    except ImportError as e:
+        raise ImportError(
+            "The onnx backend needs optimum[onnxruntime]: "
+            "pip install 'optimum[onnxruntime]'"
+        ) from e
+
+    export_dir = os.path.join(ONNX_MODEL_DIR, model_name.replace("/", "__"))
+    if os.path.isdir(export_dir):
+        return ORTModelForSeq2SeqLM.from_pretrained(export_dir)
+
+    model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+    model.save_pretrained(export_dir)
+    return model
+
+
+BACKENDS = {
+    "pytorch": load_pytorch,
+    "int8": load_int8,
+    "onnx": load_onnx,
+}
+
+
+def load_backend(name, model_name):
+    if name not in BACKENDS:
+        raise ValueError(
+            f"Unknown inference backend '{name}'. Choose one of: {', '.join(BACKENDS)}"
+        )
+    return BACKENDS[name](model_name)
@@ -0,0 +1,187 @@
+# utils/inference_pool.py
+"""Multi-process inference with a single copy of the model weights.
+
+The parent loads the model once, moves its tensors into shared memory and
+spawns the workers, which receive the tensors by handle (torch's
+multiprocessing reductions) instead of copies. Workers are spawned, not
+forked: the pool starts from the Streamlit process, on a warm-up thread,
+after torch may have started its OpenMP threads, and forking then can hang
+the children. Each worker runs with a fixed intra-op thread count and takes
+batches of token IDs from a shared task queue.
+
+Supported backends: "pytorch" shares one copy of the weights across all
+workers. "int8" works, but its packed quantized weights are pickled into
+each worker. "onnx" sessions cannot be shared: every worker loads its own.
+"""
+import itertools
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+def generate_batch(model, tokenizer, batch_ids, generate_kwargs):
+    """Pad, generate and decode one batch of token ID lists."""
+    import torch
+
+    batch = tokenizer.pad({"input_ids": batch_ids}, return_tensors="pt")
+    with torch.inference_mode():
+        output = model.generate(**batch, **generate_kwargs)
+    return [t.strip() for t in tokenizer.batch_decode(output, skip_special_tokens=True)]
+
+
+def _worker_loop(index, model, loader, tokenizer, threads, tasks, results, busy, done):
+    import torch
+    torch.set_num_threads(threads)
+    if model is None:
+        model = loader()
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        request_id, batch_ids, generate_kwargs = task
+
+        start = time.perf_counter()
+        try:
+            texts = generate_batch(model, tokenizer, batch_ids, generate_kwargs)
+            results.put((request_id, texts, None))
+        except Exception as e:
+            results.put((request_id, None, repr(e)))
+        finally:
+            with busy.get_lock():
+                busy[index] += time.perf_counter() - start
+            with done.get_lock():
+                done[index] += 1
+
+
+class InferencePool:
+    def __init__(self, loader, tokenizer, workers, threads):
+        self._loader = loader
+        self._tokenizer = tokenizer
+        self.workers = workers
+        self.threads = threads
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._busy = self._ctx.Array("d", workers)
+        self._done = self._ctx.Array("i", workers)
+        self._procs = []
+        self._pending = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._started_at = None
+        self.broken = None
+
+    def start(self):
+        # registers the pickling that passes shared tensors by handle
+        import torch.multiprocessing  # noqa: F401
+
+        # torch modules go to the workers in shared memory; anything else
+        # (an ONNX Runtime session) is loaded by each worker
+        model = self._loader()
+        if hasattr(model, "share_memory"):
+            model.share_memory()
+        else:
+            model = None
+
+        for i in range(self.workers):
+            proc = self._ctx.Process(
+                target=_worker_loop,
+                args=(i, model, self._loader, self._tokenizer, self.threads,
+                      self._tasks, self._results, self._busy, self._done),
+                name=f"inference-{i}",
+                daemon=True
+            )
+            proc.start()
+            self._procs.append(proc)
+
+        # the children map the shared weights now
+        del model
+
+        threading.Thread(target=self._collect, name="inference-results", daemon=True).start()
+        self._started_at = time.time()
+        logger.info("Inference pool started: %s workers x %s threads",
+                    self.workers, self.threads)
+
+    @property
+    def started(self):
+        return self._started_at is not None
+
+    def _collect(self):
+        while True:
+            try:
+                request_id, texts, error = self._results.get(timeout=1.0)
+            except queue.Empty:
+                if self._check_workers():
+                    return
+                continue
+            with self._lock:
+                future = self._pending.pop(request_id, None)
+            if future is not None:
+                if error:
+                    future.set_exception(RuntimeError(f"Inference worker failed: {error}"))
+                else:
+                    future.set_result(texts)
+            # other workers may keep results flowing while one is dead
+            if self._check_workers():
+                return
+
+    def _check_workers(self):
+        """Fail everything in flight once a worker has died (e.g. OOM-killed);
+        its batch would otherwise never resolve. Returns True if broken."""
+        dead = [p for p in self._procs if not p.is_alive()]
+        if not dead:
+            return False
+
+        self.broken = ", ".join(f"{p.name} exited with code {p.exitcode}" for p in dead)
+        logger.error("Inference pool broken: %s", self.broken)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError(f"Inference worker died: {self.broken}"))
+        return True
+
+    def submit(self, batch_ids, generate_kwargs=None):
+        """Queue one batch; returns a Future resolving to the summaries."""
+        if self.broken:
+            raise RuntimeError(f"Inference pool is broken: {self.broken}")
+        future = Future()
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = future
+        self._tasks.put((request_id, batch_ids, generate_kwargs or {}))
+        return future
+
+    def shutdown(self):
+        for _ in self._procs:
+            self._tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout=10)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+
+    def stats(self):
+        uptime = time.time() - self._started_at if self._started_at else 0.0
+        return {
+            "workers": self.workers,
+            "threads_per_worker": self.threads,
+            "broken": self.broken,
+            "queued": len(self._pending),
+            "per_worker": [
+                {
+                    "worker": i,
+                    "alive": proc.is_alive(),
+                    "batches": self._done[i],
+                    "busy_s": round(self._busy[i], 1),
+                    "utilization": round(self._busy[i] / uptime, 3) if uptime else 0.0,
+                }
+                for i, proc in enumerate(self._procs)
+            ],
+        }
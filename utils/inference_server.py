@@ -0,0 +1,255 @@
+# utils/inference_server.py
+"""Local inference service that batches chunk requests across sessions.
+
+Every chunk from every client goes into one queue. A batcher thread
+collects up to ``max_batch_size`` chunks with the same generation params,
+waiting at most ``max_wait_ms`` after the oldest one arrived, and runs them
+through the model as a single batch.
+
+Endpoints (HTTP over TCP or a Unix socket):
+    POST /summarize  {"chunks": [[token ids], ...], "params": {...}}
+    GET  /metrics    queue depth and batch size stats
+    GET  /health
+"""
+import http.client
+import json
+import logging
+import os
+import socket
+import socketserver
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from config.settings import SERVER_MAX_BATCH_SIZE, SERVER_MAX_WAIT_MS, SERVER_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+# ---------- MODELS ----------
+def summarizer_model(batch, params):
+    """Real model: token ID lists -> summaries via utils.summarizer."""
+    from utils.summarizer import generate_from_ids
+    return generate_from_ids(batch, batch_size=len(batch), **params)
+
+
+class StubModel:
+    """Deterministic stand-in for tests and load checks: no weights needed."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    def __call__(self, batch, params):
+        self.batches.append(len(batch))
+        if self.delay:
+            time.sleep(self.delay)
+        return [f"summary of {len(ids)} tokens" for ids in batch]
+
+
+# ---------- DYNAMIC BATCHER ----------
+class DynamicBatcher:
+    def __init__(self, model_fn, max_batch_size=SERVER_MAX_BATCH_SIZE,
+                 max_wait_ms=SERVER_MAX_WAIT_MS):
+        self.model_fn = model_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        # params key -> deque of (arrived_at, ids, future); insertion order
+        # approximates arrival order of each group's oldest item
+        self._pending = OrderedDict()
+        self._params = {}
+        self._depth = 0
+        self._cond = threading.Condition()
+        self._stopped = False
+
+        self._batch_sizes = Counter()
+        self._items = 0
+        self._batches = 0
+        self._errors = 0
+
+        self._thread = threading.Thread(target=self._run, name="batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, ids, params=None):
+        params = params or {}
+        key = json.dumps(params, sort_keys=True)
+        future = Future()
+        with self._cond:
+            self._params[key] = params
+            self._pending.setdefault(key, deque()).append((time.monotonic(), ids, future))
+            self._depth += 1
+            self._cond.notify()
+        return future
+
+    def _next_batch(self):
+        with self._cond:
+            while True:
+                if self._stopped:
+                    return None, None
+                if not self._pending:
+                    self._cond.wait()
+                    continue
+
+                # the group holding the oldest request goes first
+                key = min(self._pending, key=lambda k: self._pending[k][0][0])
+                group = self._pending[key]
+                wait_left = group[0][0] + self.max_wait - time.monotonic()
+                if len(group) < self.max_batch_size and wait_left > 0:
+                    self._cond.wait(wait_left)
+                    continue
+
+                batch = [group.popleft() for _ in range(min(len(group), self.max_batch_size))]
+                if not group:
+                    del self._pending[key]
+                self._depth -= len(batch)
+                return self._params[key], batch
+
+    def _run(self):
+        while True:
+            params, batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                outputs = self.model_fn([ids for _, ids, _ in batch], params)
+            except Exception as e:
+                logger.exception("Batch of %s failed", len(batch))
+                self._errors += 1
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self._batches += 1
+            self._items += len(batch)
+            self._batch_sizes[len(batch)] += 1
+            for (_, _, future), text in zip(batch, outputs):
+                future.set_result(text)
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def metrics(self):
+        with self._cond:
+            depth = self._depth
+        return {
+            "queue_depth": depth,
+            "batches": self._batches,
+            "items": self._items,
+            "errors": self._errors,
+            "avg_batch_size": round(self._items / self._batches, 2) if self._batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": int(self.max_wait * 1000),
+        }
+
+
+# ---------- HTTP SERVER ----------
+class _Handler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def address_string(self):
+        # Unix socket peers have no (host, port)
+        return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - %s", self.address_string(), fmt % args)
+
+    def _reply(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self._reply(200, self.batcher.metrics())
+        elif self.path == "/health":
+            self._reply(200, {"status": "ok"})
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/summarize":
+            self._reply(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            futures = [self.batcher.submit(ids, request.get("params"))
+                       for ids in request["chunks"]]
+            summaries = [f.result(timeout=SERVER_TIMEOUT) for f in futures]
+        except (KeyError, ValueError) as e:
+            self._reply(400, {"error": f"bad request: {e}"})
+            return
+        except Exception as e:
+            self._reply(500, {"error": str(e)})
+            return
+        self._reply(200, {"summaries": summaries})
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def make_server(batcher, host="127.0.0.1", port=8765, unix_socket=None):
+    handler = type("Handler", (_Handler,), {"batcher": batcher})
+    if unix_socket:
+        return _UnixHTTPServer(unix_socket, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+# ---------- CLIENT ----------
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self._path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self._path)
+
+
+class InferenceClient:
+    def __init__(self, url, timeout=SERVER_TIMEOUT):
+        self.url = urlparse(url)
+        self.timeout = timeout
+
+    def _connection(self):
+        if self.url.scheme == "unix":
+            return _UnixHTTPConnection(self.url.path, self.timeout)
+        return http.client.HTTPConnection(self.url.hostname, self.url.port or 80,
+                                          timeout=self.timeout)
+
+    def _request(self, method, path, body=None):
+        conn = self._connection()
+        try:
+            data = json.dumps(body).encode() if body is not None else None
+            headers = {"Content-Type": "application/json"} if data else {}
+            conn.request(method, path, body=data, headers=headers)
+            response = conn.getresponse()
+            payload = json.loads(response.read() or b"{}")
+        finally:
+            conn.close()
+        if response.status != 200:
+            raise RuntimeError(f"Inference server error {response.status}: {payload.get('error')}")
+        return payload
+
+    def summarize(self, chunk_ids, params=None):
+        return self._request("POST", "/summarize",
+                             {"chunks": chunk_ids, "params": params or {}})["summaries"]
+
+    def metrics(self):
+        return self._request("GET", "/metrics")
@@ -1,5 +1,10 @@
 # utils/init_db.py
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from database import db
+from config.settings import SUMMARY_CACHE_TTL, EXTRACTION_CACHE_TTL
 
 def init_db():
     # Users: unique index on email
@@ -10,6 +15,28 @@ def init_db():
     # Summaries: index user_id and book_id
     db.summaries.create_index([("user_id", 1)])
     db.summaries.create_index([("book_id", 1)])
+    # Chapter summaries: one per chapter and length/style
+    db.chapter_summaries.create_index(
+        [("book_id", 1), ("chapter_index", 1), ("summary_length", 1), ("summary_style", 1)],
+        unique=True
+    )
+    # Archived book versions
+    db.book_versions.create_index([("book_id", 1), ("version", 1)], unique=True)
+    # Chunk summary cache: TTL expiry + LRU trimming
+    db.chunk_summary_cache.create_index(
+        [("created_at", 1)], expireAfterSeconds=SUMMARY_CACHE_TTL
+    )
+    db.chunk_summary_cache.create_index([("last_used", 1)])
+    # Extraction cache: TTL expiry + LRU trimming
+    db.extraction_cache.create_index(
+        [("created_at", 1)], expireAfterSeconds=EXTRACTION_CACHE_TTL
+    )
+    db.extraction_cache.create_index([("last_used", 1)])
+    # Large books: text blocks in order
+    db.book_text_blocks.create_index([("book_id", 1), ("seq", 1)], unique=True)
+    # Jobs: claim order and expired-lease lookups
+    db.jobs.create_index([("status", 1), ("available_at", 1)])
+    db.jobs.create_index([("status", 1), ("lease_expires", 1)])
     print("Indexes created successfully")
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+# utils/job_queue.py
+"""Durable job queue stored in MongoDB.
+
+A job moves ``queued -> running -> done``. Workers claim jobs atomically
+with ``find_one_and_update`` and hold them under a lease that heartbeats
+extend; a job whose lease expires (worker crashed) is claimed again by
+another worker. Failures are retried with exponential backoff and moved
+to ``dead_jobs`` after ``max_attempts``.
+"""
+import logging
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+from config.settings import (
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_BACKOFF_BASE,
+    JOB_BACKOFF_MAX
+)
+from utils.database import jobs, dead_jobs, oid, update_book_status
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_job(job_type, payload, max_attempts=JOB_MAX_ATTEMPTS, delay=0):
+    now = datetime.utcnow()
+    return jobs.insert_one({
+        "type": job_type,
+        "payload": payload,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "available_at": now + timedelta(seconds=delay),
+        "created_at": now,
+        "worker_id": None,
+        "lease_expires": None,
+        "last_error": None
+    }).inserted_id
+
+
+def claim_job(worker_id, job_types=None, lease_seconds=JOB_LEASE_SECONDS):
+    """Atomically take the oldest runnable job, or return None."""
+    while True:
+        now = datetime.utcnow()
+        query = {"$or": [
+            {"status": "queued", "available_at": {"$lte": now}},
+            # lease ran out: the worker holding it is gone
+            {"status": "running", "lease_expires": {"$lt": now}},
+        ]}
+        if job_types:
+            query["type"] = {"$in": list(job_types)}
+
+        job = jobs.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": "running",
+                    "worker_id": worker_id,
+                    "lease_expires": now + timedelta(seconds=lease_seconds),
+                    "heartbeat_at": now,
+                    "started_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None:
+            return None
+
+        # reclaimed after too many crashed attempts
+        if job["attempts"] > job["max_attempts"]:
+            _dead_letter(job, worker_id, job.get("last_error") or "lease expired")
+            continue
+        return job
+
+
+def heartbeat(job_id, worker_id, lease_seconds=JOB_LEASE_SECONDS):
+    """Extend the lease; returns False if this worker no longer owns the job."""
+    result = jobs.update_one(
+        {"_id": oid(job_id), "worker_id": worker_id, "status": "running"},
+        {"$set": {
+            "lease_expires": datetime.utcnow() + timedelta(seconds=lease_seconds),
+            "heartbeat_at": datetime.utcnow()
+        }}
+    )
+    return result.matched_count == 1
+
+
+def complete_job(job_id, worker_id, result=None):
+    jobs.update_one(
+        {"_id": oid(job_id), "worker_id": worker_id},
+        {"$set": {
+            "status": "done",
+            "result": result,
+            "finished_at": datetime.utcnow(),
+            "lease_expires": None
+        }}
+    )
+
+
+def backoff_seconds(attempts):
+    return min(JOB_BACKOFF_BASE * 2 ** max(attempts - 1, 0), JOB_BACKOFF_MAX)
+
+
+def fail_job(job, worker_id, error):
+    """Schedule a retry, or dead-letter the job once attempts run out.
+
+    Returns True if the job was dead-lettered.
+    """
+    if job["attempts"] >= job["max_attempts"]:
+        return _dead_letter(job, worker_id, error)
+
+    delay = backoff_seconds(job["attempts"])
+    jobs.update_one(
+        {"_id": job["_id"], "worker_id": worker_id},
+        {"$set": {
+            "status": "queued",
+            "available_at": datetime.utcnow() + timedelta(seconds=delay),
+            "last_error": str(error),
+            "worker_id": None,
+            "lease_expires": None
+        }}
+    )
+    logger.warning("Job %s failed (attempt %s), retry in %ss: %s",
+                   job["_id"], job["attempts"], delay, error)
+    return False
+
+
+def _dead_letter(job, worker_id, error):
+    """Move a job this worker owns to dead_jobs and mark its book failed.
+
+    Returns False if another worker has taken the job over meanwhile.
+    """
+    job = jobs.find_one_and_delete({"_id": job["_id"], "worker_id": worker_id})
+    if job is None:
+        return False
+
+    job.update(status="dead", last_error=str(error), dead_at=datetime.utcnow())
+    dead_jobs.replace_one({"_id": job["_id"]}, job, upsert=True)
+    logger.error("Job %s dead-lettered after %s attempts: %s",
+                 job["_id"], job["attempts"], error)
+
+    # covers workers that crash every attempt, not only ones that raise
+    book_id = job["payload"].get("book_id")
+    if book_id:
+        update_book_status(book_id, "failed")
+    return True
+
+
+def get_job(job_id):
+    return jobs.find_one({"_id": oid(job_id)}) or dead_jobs.find_one({"_id": oid(job_id)})
+
+
+def queue_stats():
+    counts = {s["_id"]: s["count"] for s in jobs.aggregate([
+        {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+    ])}
+    counts["dead"] = dead_jobs.estimated_document_count()
+    return counts
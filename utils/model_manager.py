@@ -0,0 +1,142 @@
+# utils/model_manager.py
+import gc
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class ModelManager:
+    """Process-wide owner of a lazily loaded model.
+
+    The model is built on first use (or by ``warm_up``), shared by every
+    caller in the process, and dropped again after ``idle_timeout`` seconds
+    without use.
+    """
+
+    def __init__(self, loader, name, idle_timeout=0):
+        self._loader = loader
+        self.name = name
+        self.idle_timeout = idle_timeout
+
+        self._model = None
+        # held only for bookkeeping; the load itself runs outside it so
+        # status() and other callers never wait behind a slow load
+        self._lock = threading.Condition()
+        self._loading = False
+        self._in_use = 0
+        self._last_used = 0.0
+        self._load_time = None
+        self._loads = 0
+        self._warming = None
+        self._reaper = None
+
+    # ---------- LOADING ----------
+    def get(self):
+        with self._lock:
+            while self._loading:
+                self._lock.wait()
+            if self._model is not None:
+                self._last_used = time.time()
+                return self._model
+            self._loading = True
+
+        start = time.perf_counter()
+        logger.info("Loading model %s", self.name)
+        try:
+            model = self._loader()
+        except BaseException:
+            with self._lock:
+                self._loading = False
+                self._lock.notify_all()
+            raise
+
+        with self._lock:
+            self._model = model
+            self._load_time = time.perf_counter() - start
+            self._loads += 1
+            self._last_used = time.time()
+            self._loading = False
+            self._lock.notify_all()
+            logger.info("Model %s loaded in %.1fs", self.name, self._load_time)
+            self._start_reaper()
+            return model
+
+    @contextmanager
+    def use(self):
+        """Borrow the model; it is never unloaded while borrowed."""
+        while True:
+            model = self.get()
+            with self._lock:
+                # the reaper may have unloaded it between get() and here
+                if self._model is model:
+                    self._in_use += 1
+                    break
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._in_use -= 1
+                self._last_used = time.time()
+
+    def warm_up(self, background=True):
+        """Load the model ahead of the first request. Safe to call repeatedly."""
+        with self._lock:
+            if self._model is not None or self._loading:
+                return
+            if self._warming and self._warming.is_alive():
+                return
+            if background:
+                self._warming = threading.Thread(
+                    target=self.get, name=f"warmup-{self.name}", daemon=True
+                )
+                self._warming.start()
+                return
+        self.get()
+
+    # ---------- UNLOADING ----------
+    def unload(self):
+        with self._lock:
+            if self._model is None or self._in_use or self._loading:
+                return False
+            self._model = None
+        gc.collect()
+        logger.info("Model %s unloaded", self.name)
+        return True
+
+    def _start_reaper(self):
+        if not self.idle_timeout or (self._reaper and self._reaper.is_alive()):
+            return
+        self._reaper = threading.Thread(
+            target=self._reap, name=f"reaper-{self.name}", daemon=True
+        )
+        self._reaper.start()
+
+    def _reap(self):
+        interval = max(1.0, min(self.idle_timeout / 4, 30.0))
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if self._model is None:
+                    return
+                idle = time.time() - self._last_used
+                if self._in_use or idle < self.idle_timeout:
+                    continue
+            if self.unload():
+                return
+
+    # ---------- STATUS ----------
+    def status(self):
+        with self._lock:
+            loaded = self._model is not None
+            return {
+                "model": self.name,
+                "state": "warm" if loaded else "cold",
+                "loading": self._loading,
+                "load_time_s": round(self._load_time, 2) if self._load_time else None,
+                "loads": self._loads,
+                "in_use": self._in_use,
+                "idle_s": round(time.time() - self._last_used, 1) if loaded else None,
+            }
@@ -22,6 +22,8 @@ def remove_duplicate_sentences(text):
     return " ".join(result)
 
 
+# Generation is already bounded per length (utils.summarizer.LENGTH_PROFILES);
+# this only trims the rare overshoot.
 def limit_length(text, level="medium"):
     words = text.split()
 
@@ -32,6 +34,25 @@ def limit_length(text, level="medium"):
     return " ".join(words[:150])  # medium default
 
 
+# Styles are formatting over the same summary text, so a new style never
+# needs the model (see utils.full_summary.summary_variants)
+STYLES = ("simple", "paragraphs", "bullets")
+
+
+def apply_style(text, style="simple", paragraph_sentences=4):
+    text = clean_text(text)
+    sentences = re.split(r'(?<=[.!?])\s+', text) if text else []
+
+    if style == "bullets":
+        return "\n".join(f"- {s}" for s in sentences)
+    if style == "paragraphs":
+        return "\n\n".join(
+            " ".join(sentences[i:i + paragraph_sentences])
+            for i in range(0, len(sentences), paragraph_sentences)
+        )
+    return text
+
+
 def extract_keywords(text, top_n=5):
     words = re.findall(r'\b[a-zA-Z]{4,}\b', text.lower())
     common = Counter(words).most_common(top_n)
@@ -1,6 +1,147 @@
-from transformers import pipeline
+import threading
 
-model = pipeline("summarization", model="facebook/bart-large-cnn")
+from config.settings import (
+    SUMMARIZER_MODEL,
+    SUMMARIZER_BACKEND,
+    SUMMARY_BATCH_SIZE,
+    SUMMARIZER_IDLE_TIMEOUT,
+    SUMMARIZER_POOL_WORKERS,
+    SUMMARIZER_POOL_THREADS,
+    SUMMARIZER_SERVER_URL,
+    SERVER_TIMEOUT
+)
+from utils.chunking import get_tokenizer, token_budget
+from utils.inference_backends import load_backend
+from utils.inference_pool import InferencePool, generate_batch
+from utils.inference_server import InferenceClient
+from utils.model_manager import ModelManager
 
-def generate_summary(text):
-    return model(text[:1024])[0]["summary_text"]
+
+def _load_model():
+    return load_backend(SUMMARIZER_BACKEND, SUMMARIZER_MODEL)
+
+
+# one shared instance per process, loaded on first use
+model_manager = ModelManager(
+    _load_model,
+    name=f"{SUMMARIZER_MODEL} ({SUMMARIZER_BACKEND})",
+    idle_timeout=SUMMARIZER_IDLE_TIMEOUT
+)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_inference_pool():
+    """Shared-weight worker pool, started on first use (None when disabled)."""
+    global _pool
+    if not SUMMARIZER_POOL_WORKERS:
+        return None
+    with _pool_lock:
+        if _pool is not None and _pool.broken:
+            # a worker died; start over with a fresh set of workers
+            _pool.shutdown()
+            _pool = None
+        if _pool is None:
+            _pool = InferencePool(
+                _load_model,
+                get_tokenizer(SUMMARIZER_MODEL),
+                workers=SUMMARIZER_POOL_WORKERS,
+                threads=SUMMARIZER_POOL_THREADS
+            )
+            _pool.start()
+        return _pool
+
+
+def warm_up():
+    """Load the model (or start the inference pool) in the background."""
+    if SUMMARIZER_POOL_WORKERS:
+        if _pool is None:
+            threading.Thread(target=get_inference_pool, name="pool-warmup", daemon=True).start()
+    else:
+        model_manager.warm_up()
+
+
+def summarizer_status():
+    """Model status for the UI: the in-process model, or the inference pool
+    with per-worker utilization."""
+    if not SUMMARIZER_POOL_WORKERS:
+        return model_manager.status()
+
+    pool = _pool
+    started = pool is not None and pool.started
+    return {
+        "model": model_manager.name,
+        "state": "warm" if started and not pool.broken else "cold",
+        "loading": _pool_lock.locked() and not started,
+        "load_time_s": None,
+        "pool": pool.stats() if started else None,
+    }
+
+
+# summary_length -> generation limits and decoding strategy, so the decoder
+# stops once it has produced enough instead of being truncated afterwards
+LENGTH_PROFILES = {
+    "short": {"max_new_tokens": 64, "min_length": 20, "num_beams": 1},
+    "medium": {"max_new_tokens": 128, "min_length": 40, "num_beams": 2, "early_stopping": True},
+    "long": {"max_new_tokens": 220, "min_length": 80, "num_beams": 4, "early_stopping": True},
+}
+
+
+def length_profile(summary_length="medium"):
+    return dict(LENGTH_PROFILES.get(summary_length, LENGTH_PROFILES["medium"]))
+
+
+def _input_ids(chunk, tokenizer):
+    # chunks from utils.chunking already carry their token IDs
+    if isinstance(chunk, dict):
+        return chunk["input_ids"]
+    ids = tokenizer(chunk, add_special_tokens=False)["input_ids"]
+    ids = ids[:token_budget(tokenizer)]
+    return tokenizer.build_inputs_with_special_tokens(ids)
+
+
+def generate_summary(chunk, summary_length="medium"):
+    return generate_summaries([chunk], batch_size=1, **length_profile(summary_length))[0]
+
+
+def generate_summaries(chunks, batch_size=SUMMARY_BATCH_SIZE, **generate_kwargs):
+    """Summarize many chunks, batching chunks of similar length together.
+
+    Chunks are sorted by token count before batching so each batch pads to
+    roughly the same size; results come back in the original order.
+    """
+    tokenizer = get_tokenizer(SUMMARIZER_MODEL)
+    ids = [_input_ids(c, tokenizer) for c in chunks]
+    # client mode: the inference server batches across all sessions itself
+    if SUMMARIZER_SERVER_URL:
+        return InferenceClient(SUMMARIZER_SERVER_URL).summarize(ids, generate_kwargs)
+
+    return generate_from_ids(ids, batch_size=batch_size, **generate_kwargs)
+
+
+def generate_from_ids(ids, batch_size=SUMMARY_BATCH_SIZE, **generate_kwargs):
+    """Run token ID lists through the local model (or inference pool)."""
+    tokenizer = get_tokenizer(SUMMARIZER_MODEL)
+    order = sorted(range(len(ids)), key=lambda i: len(ids[i]))
+    batches = [order[i:i + batch_size] for i in range(0, len(order), batch_size)]
+    results = [None] * len(ids)
+
+    pool = get_inference_pool()
+    if pool is not None:
+        # all batches go out at once; the pool spreads them over its workers
+        futures = [pool.submit([ids[i] for i in b], generate_kwargs) for b in batches]
+        for batch, future in zip(batches, futures):
+            # backstop; a dead worker already fails its futures
+            for i, summary in zip(batch, future.result(timeout=SERVER_TIMEOUT)):
+                results[i] = summary
+        return results
+
+    with model_manager.use() as model:
+        for batch in batches:
+            texts = generate_batch(model, tokenizer, [ids[i] for i in batch], generate_kwargs)
+            for i, summary in zip(batch, texts):
+                results[i] = summary
+
+    return results
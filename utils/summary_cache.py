@@ -0,0 +1,28 @@
+# utils/summary_cache.py
+from config.settings import (
+    SUMMARIZER_MODEL,
+    SUMMARIZER_BACKEND,
+    SUMMARY_CACHE_MAX_ENTRIES,
+    SUMMARY_CACHE_TTL,
+    SUMMARY_CACHE_DB_MAX_ENTRIES
+)
+from utils.cache import LRUCache, MongoCache, TieredCache, content_key
+from utils.database import chunk_summary_cache
+
+summary_cache = TieredCache(
+    LRUCache(SUMMARY_CACHE_MAX_ENTRIES, ttl=SUMMARY_CACHE_TTL),
+    MongoCache(
+        chunk_summary_cache,
+        ttl=SUMMARY_CACHE_TTL,
+        max_entries=SUMMARY_CACHE_DB_MAX_ENTRIES
+    )
+)
+
+
+# quantized backends produce slightly different text, so they get their own keys
+def chunk_key(text, params=None, model_name=f"{SUMMARIZER_MODEL}:{SUMMARIZER_BACKEND}"):
+    return content_key(model_name, params or {}, text)
+
+
+def cache_stats():
+    return summary_cache.stats()